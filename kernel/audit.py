@@ -13,17 +13,74 @@ Every privileged operation is logged with:
 
 from __future__ import annotations
 
+import atexit
+import hashlib
 import json
+import os
+import re
 import sqlite3
+import sys
 import threading
 import time
 import uuid
-from dataclasses import dataclass, field, asdict
+import weakref
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Iterator, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 
+# Pending rows are written with a single executemany + commit once this many
+# accumulate, or once the oldest pending row is this many seconds old.
+DEFAULT_FLUSH_EVERY = 128
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Connection tuning applied once at connect time. WAL + NORMAL sync means a
+# commit appends to the write-ahead log without a full fsync of the database.
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# One shared compact encoder for args; non-JSON values are stringified
+# rather than failing the log call.
+_encode_args = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+# Upper bound on memoized field-name hashes per log (names are schema-sized).
+FIELD_HASH_CACHE_SIZE = 1024
+
+# Cached redaction plans per log; one per distinct args key set.
+REDACTION_PLAN_CACHE_SIZE = 1024
+
+# (all keys pass through unchanged, [(key, output_key, is_sensitive), ...])
+RedactionPlan = tuple[bool, list[tuple[str, str, bool]]]
+
+# Under these parent keys, list items are field names and get PII-hashed.
+_FIELD_LIST_KEYS = ("fields", "filled_fields")
+
+# Rows fetched per round-trip when streaming query results.
+QUERY_BATCH_SIZE = 256
+
+_SELECT_TEMPLATE = """
+    SELECT id, timestamp, op, principal, object, args, result,
+           tx_id, checkpoint_id, provenance, correlation_id
+    FROM audit_log
+    WHERE {where}
+    ORDER BY timestamp ASC
+    LIMIT ?
+"""
+_COUNT_TEMPLATE = "SELECT COUNT(*) FROM audit_log WHERE {where}"
+_COUNT_LIMITED_TEMPLATE = "SELECT COUNT(*) FROM (SELECT 1 FROM audit_log WHERE {where} LIMIT ?)"
+
+_INSERT_SQL = """
+    INSERT INTO audit_log
+    (id, timestamp, op, principal, object, args, result, tx_id, checkpoint_id, provenance, correlation_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 class Provenance(Enum):
     """Origin of an action or content."""
     HUMAN = "human"
@@ -32,7 +89,7 @@ class Provenance(Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     """A single entry in the audit log."""
     id: str
@@ -48,9 +105,19 @@ class AuditEntry:
     correlation_id: Optional[str] = None
     
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["provenance"] = self.provenance.value
-        return d
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "op": self.op,
+            "principal": self.principal,
+            "object": self.object,
+            "args": self.args,
+            "result": self.result,
+            "tx_id": self.tx_id,
+            "checkpoint_id": self.checkpoint_id,
+            "provenance": self.provenance.value,
+            "correlation_id": self.correlation_id,
+        }
     
     @classmethod
     def from_dict(cls, d: dict) -> AuditEntry:
@@ -59,6 +126,49 @@ class AuditEntry:
         return cls(**d)
 
 
+def _uuid7(timestamp: float) -> str:
+    """A UUIDv7-style id: 48-bit Unix milliseconds followed by random bits.
+    
+    Ids sort by creation time, unlike uuid4, while staying globally unique.
+    """
+    rand = int.from_bytes(os.urandom(10), "big")  # 80 bits, 74 used
+    value = (int(timestamp * 1000) & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76  # version
+    value |= (rand >> 68) << 64  # rand_a: 12 bits
+    value |= 0b10 << 62  # RFC 4122 variant
+    value |= rand & ((1 << 62) - 1)  # rand_b: 62 bits
+    return str(uuid.UUID(int=value))
+
+
+def _background_writer(log_ref: weakref.ref, wake: threading.Event, interval: float) -> None:
+    """Flush an AuditLog when woken or every interval; exits once the log is closed or gone.
+    
+    Holds only a weak reference so an idle writer never keeps its log alive.
+    """
+    while True:
+        wake.wait(interval)
+        wake.clear()
+        log = log_ref()
+        if log is None or log.closed:
+            return
+        log.flush()
+        del log
+
+
+# Disk-backed logs not yet closed. One atexit hook closes whatever is left;
+# close() removes a log, so opening and closing logs never grows the set.
+_open_logs: weakref.WeakSet[AuditLog] = weakref.WeakSet()
+
+
+def _close_open_logs() -> None:
+    """atexit hook: close every disk-backed log still open."""
+    for log in list(_open_logs):
+        log.close()
+
+
+atexit.register(_close_open_logs)
+
+
 class AuditLog:
     """Append-only audit log with SQLite persistence.
     
@@ -68,35 +178,109 @@ class AuditLog:
     - Secrets are never recorded (caller responsibility)
     - PII-safe: field names are hashed to prevent leaking schema info
     - Supports query/export for replay and debugging
+    
+    Writes are buffered: rows are inserted in batches with one commit per
+    batch. A log()/log_many() call that makes a flush due returns only once
+    its rows are written. Reads (query/count/export) flush pending rows
+    first, so callers always observe their own writes. Call flush() to
+    force durability.
     """
     
-    def __init__(self, db_path: Optional[str | Path] = None, workspace_salt: Optional[str] = None):
+    def __init__(
+        self,
+        db_path: Optional[str | Path] = None,
+        workspace_salt: Optional[str] = None,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ):
         """Initialize the audit log.
         
         Args:
             db_path: Path to SQLite database. If None, uses in-memory DB.
             workspace_salt: Salt for hashing field names (PII protection).
                           If None, generates a random salt.
+            flush_every: Number of buffered entries that triggers a write.
+            flush_interval: Seconds after which buffered entries are written
+                          on the next log call, regardless of count.
         """
         self._db_path = str(db_path) if db_path else ":memory:"
         self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        self._lock = threading.Lock()
+        self._configure_connection(self._conn)
+        self._lock = threading.Lock()  # serializes writes (and in-memory reads)
+        self._local = threading.local()  # per-thread read connection
+        # Every reader connection with its owning thread, so close() can
+        # close them all; readers of exited threads are closed on the way
+        self._readers: list[tuple[weakref.ref, sqlite3.Connection]] = []
+        self._readers_lock = threading.Lock()
         self._current_tx: Optional[str] = None
         self._current_checkpoint: Optional[str] = None
         self._redact_keys: set[str] = {"password", "secret", "token", "key", "credential"}
         self._pii_field_names: set[str] = {"ssn", "social_security", "dob", "date_of_birth", 
                                             "credit_card", "card_number", "cvv", "phone",
                                             "address", "zip", "postal"}
+        # Sensitivity is "key ends with a redact key"; PII is "name contains a
+        # PII token". Both are compiled once so _redact does C-level checks.
+        self._redact_suffixes = tuple(self._redact_keys)
+        self._pii_re = re.compile("|".join(map(re.escape, sorted(self._pii_field_names))))
+        self._field_hash_cache: dict[str, str] = {}
+        self._plan_cache: dict[tuple[tuple, bool], RedactionPlan] = {}
+        self._stmt_cache: dict[tuple[str, tuple[str, ...]], str] = {}
         self._workspace_salt = workspace_salt or uuid.uuid4().hex
         self._hash_field_names = True  # Enable PII protection by default
+        self._pending: list[tuple] = []  # appended without the lock; see _enqueue
+        self._flush_every = max(1, flush_every)
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._flush_requested = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
         self._init_db()
+        if self._db_path != ":memory:":
+            # Buffered entries must reach disk even if the owner never closes
+            _open_logs.add(self)
+    
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """Apply journal and sync pragmas (WAL is skipped for in-memory DBs)."""
+        if self._db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in _SQLITE_PRAGMAS:
+            conn.execute(pragma)
+    
+    def _reader(self) -> tuple[sqlite3.Connection, AbstractContextManager]:
+        """Flush pending writes; return the connection for reads and its guard.
+        
+        File-backed logs read through a per-thread connection with no lock,
+        so readers never wait on the writer (WAL allows concurrent readers).
+        An in-memory DB exists only on the shared connection, so reads there
+        are guarded by the write lock.
+        """
+        self.flush()
+        if self._db_path == ":memory:":
+            return self._conn, self._lock
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._configure_connection(conn)
+            self._local.conn = conn
+            with self._readers_lock:
+                live = []
+                for thread_ref, reader in self._readers:
+                    thread = thread_ref()
+                    if thread is not None and thread.is_alive():
+                        live.append((thread_ref, reader))
+                    else:
+                        reader.close()
+                live.append((weakref.ref(threading.current_thread()), conn))
+                self._readers = live
+        return conn, nullcontext()
     
     def _init_db(self) -> None:
         """Initialize the database schema."""
         with self._lock:
             self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS audit_log (
-                    id TEXT PRIMARY KEY,
+                    seq INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL,
                     timestamp REAL NOT NULL,
                     op TEXT NOT NULL,
                     principal TEXT NOT NULL,
@@ -128,41 +312,69 @@ class AuditLog:
         
         Uses salted SHA256, truncated to 8 chars for readability.
         The salt is workspace-specific so hashes differ across workspaces.
+        Results are memoized per distinct name.
         """
-        import hashlib
-        salted = f"{field_name}:{self._workspace_salt}"
-        return hashlib.sha256(salted.encode()).hexdigest()[:8]
+        hashed = self._field_hash_cache.get(field_name)
+        if hashed is None:
+            salted = f"{field_name}:{self._workspace_salt}"
+            hashed = hashlib.sha256(salted.encode()).hexdigest()[:8]
+            if len(self._field_hash_cache) < FIELD_HASH_CACHE_SIZE:
+                self._field_hash_cache[field_name] = hashed
+        return hashed
     
     def _is_pii_field(self, field_name: str) -> bool:
         """Check if a field name indicates PII."""
-        name_lower = field_name.lower()
-        return any(pii in name_lower for pii in self._pii_field_names)
+        return self._pii_re.search(field_name.lower()) is not None
+    
+    def _redaction_plan(self, keys: tuple) -> RedactionPlan:
+        """Classify a key set once: (all keys pass through, [(key, output_key, sensitive)]).
+        
+        The same op logs the same arg shape every time, so plans are cached
+        per key tuple (and hashing mode) and reused without re-running the
+        sensitivity regex or the salted hash.
+        """
+        cache_key = (keys, self._hash_field_names)
+        plan = self._plan_cache.get(cache_key)
+        if plan is not None:
+            return plan
+        
+        steps = []
+        all_pass = True
+        for k in keys:
+            is_sensitive = k.lower().endswith(self._redact_suffixes)
+            should_hash_key = self._hash_field_names and self._is_pii_field(k)
+            output_key = f"[PII:{self._hash_field_name(k)}]" if should_hash_key else k
+            all_pass = all_pass and not is_sensitive and output_key is k
+            steps.append((k, output_key, is_sensitive))
+        
+        plan = (all_pass, steps)
+        if len(self._plan_cache) < REDACTION_PLAN_CACHE_SIZE:
+            self._plan_cache[cache_key] = plan
+        return plan
     
     def _redact(self, args: dict, parent_key: str = "") -> dict:
         """Redact sensitive values and hash PII field names from args.
         
         - Sensitive values (passwords, tokens) are replaced with [REDACTED]
         - PII field names (ssn, credit_card) are hashed to prevent schema leakage
+        
+        Per-key decisions come from a cached plan; args whose keys all pass
+        through and hold no nested dicts (the common case) are returned as a
+        shallow copy.
         """
+        all_pass, steps = self._redaction_plan(tuple(args))
+        is_field_list = parent_key in _FIELD_LIST_KEYS
+        if all_pass and not is_field_list and not any(isinstance(v, dict) for v in args.values()):
+            return dict(args)
+        
         result = {}
-        for k, v in args.items():
-            key_lower = k.lower()
-            
-            # Check if value should be redacted
-            is_sensitive = any(
-                key_lower == sensitive or key_lower.endswith(f"_{sensitive}") or key_lower.endswith(sensitive)
-                for sensitive in self._redact_keys
-            )
-            
-            # Check if field name is PII and should be hashed
-            should_hash_key = self._hash_field_names and self._is_pii_field(k)
-            output_key = f"[PII:{self._hash_field_name(k)}]" if should_hash_key else k
-            
+        for k, output_key, is_sensitive in steps:
+            v = args[k]
             if is_sensitive:
                 result[output_key] = "[REDACTED]"
             elif isinstance(v, dict):
                 result[output_key] = self._redact(v, parent_key=k)
-            elif isinstance(v, list) and parent_key in ("fields", "filled_fields"):
+            elif isinstance(v, (list, tuple)) and is_field_list:
                 # Hash field names in lists (e.g., form field lists)
                 if self._hash_field_names:
                     result[output_key] = [
@@ -199,44 +411,193 @@ class AuditLog:
         Returns:
             The created AuditEntry
         """
-        entry = AuditEntry(
-            id=str(uuid.uuid4()),
-            timestamp=time.time(),
-            op=op,
-            principal=principal,
+        entry = self._make_entry(op, principal, object, args, result, provenance, correlation_id)
+        self._enqueue([self._to_row(entry)])
+        return entry
+    
+    def log_many(self, entries: Iterable[dict]) -> list[AuditEntry]:
+        """Log a burst of operations with a single buffered write.
+        
+        Args:
+            entries: Dicts of keyword arguments accepted by log()
+            
+        Returns:
+            The created AuditEntry objects, in input order
+        
+        Example:
+            audit.log_many([
+                {"op": "tab.open", "principal": "agent:1", "object": "tab:1"},
+                {"op": "tab.navigate", "principal": "agent:1", "object": "tab:1"},
+            ])
+        """
+        created = [self._make_entry(**kwargs) for kwargs in entries]
+        self._enqueue([self._to_row(entry) for entry in created])
+        return created
+    
+    def log_async(
+        self,
+        op: str,
+        principal: str,
+        object: str,
+        args: Optional[dict] = None,
+        result: str = "success",
+        provenance: Provenance = Provenance.SYSTEM,
+        correlation_id: Optional[str] = None,
+    ) -> AuditEntry:
+        """Log an operation without ever blocking on a database write.
+        
+        The entry is built (redacted, bound to the current transaction) and
+        buffered immediately; when a flush is due it is handed to a background
+        writer thread instead of running on the caller's thread. Reads still
+        see the entry since they flush the buffer first.
+        
+        Use for high-frequency, low-risk events (e.g. allowed capability
+        checks); keep denials and grants on the synchronous log().
+        """
+        entry = self._make_entry(op, principal, object, args, result, provenance, correlation_id)
+        self._pending.append(self._to_row(entry))
+        if self._flush_due():
+            self._start_writer()
+            self._flush_requested.set()
+        return entry
+    
+    def flush(self) -> None:
+        """Write all buffered entries to the database (a no-op once closed)."""
+        with self._lock:
+            # The background writer can wake after a concurrent close()
+            if self._closed:
+                return
+            self._flush_locked()
+    
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+    
+    def close(self) -> None:
+        """Flush buffered entries, refresh query planner stats, and close.
+        
+        Idempotent. The log must not be used after closing.
+        
+        Example:
+            with AuditLog("audit.db") as audit:
+                audit.log(op="tab.open", principal="agent:1", object="tab:1")
+            # entries are on disk here
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_locked()
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+        _open_logs.discard(self)
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for _, reader in readers:
+            reader.close()
+        self._local.conn = None
+        self._flush_requested.set()  # let the background writer exit
+    
+    def __enter__(self) -> AuditLog:
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+    
+    def _make_entry(
+        self,
+        op: str,
+        principal: str,
+        object: str,
+        args: Optional[dict] = None,
+        result: str = "success",
+        provenance: Provenance = Provenance.SYSTEM,
+        correlation_id: Optional[str] = None,
+    ) -> AuditEntry:
+        """Build a redacted entry bound to the current transaction context.
+        
+        Low-cardinality strings (op, principal) are interned so buffered and
+        returned entries share one copy per distinct value.
+        """
+        now = time.time()
+        return AuditEntry(
+            id=_uuid7(now),
+            timestamp=now,
+            op=sys.intern(op),
+            principal=sys.intern(principal),
             object=object,
-            args=self._redact(args or {}),
+            args=self._redact(args) if args else {},
             result=result,
             tx_id=self._current_tx,
             checkpoint_id=self._current_checkpoint,
             provenance=provenance,
             correlation_id=correlation_id,
         )
+    
+    @staticmethod
+    def _to_row(entry: AuditEntry) -> tuple:
+        """Convert an entry to an INSERT parameter tuple."""
+        return (
+            entry.id,
+            entry.timestamp,
+            entry.op,
+            entry.principal,
+            entry.object,
+            _encode_args(entry.args),
+            entry.result,
+            entry.tx_id,
+            entry.checkpoint_id,
+            entry.provenance.value,
+            entry.correlation_id,
+        )
+    
+    def _enqueue(self, rows: list[tuple]) -> None:
+        """Buffer rows, flushing when the size or age threshold is reached.
         
-        with self._lock:
-            self._conn.execute(
-                """
-                INSERT INTO audit_log 
-                (id, timestamp, op, principal, object, args, result, tx_id, checkpoint_id, provenance, correlation_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    entry.id,
-                    entry.timestamp,
-                    entry.op,
-                    entry.principal,
-                    entry.object,
-                    json.dumps(entry.args),
-                    entry.result,
-                    entry.tx_id,
-                    entry.checkpoint_id,
-                    entry.provenance.value,
-                    entry.correlation_id,
-                ),
-            )
-            self._conn.commit()
+        When a flush is due the rows are written before this returns.
+        Appending needs no lock, and a thread already flushing keeps draining
+        until the buffer is empty, so it usually writes these rows in its
+        batch; by the time this caller gets the lock there is nothing left.
+        """
+        self._pending.extend(rows)
+        if self._flush_due():
+            with self._lock:
+                self._flush_locked()
+    
+    def _flush_due(self) -> bool:
+        """Whether buffered rows hit the size or age threshold."""
+        return (
+            len(self._pending) >= self._flush_every
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        )
+    
+    def _start_writer(self) -> None:
+        """Start the background writer used by log_async(), once."""
+        if self._writer is not None:
+            return
+        self._writer = threading.Thread(
+            target=_background_writer,
+            args=(weakref.ref(self), self._flush_requested, self._flush_interval),
+            name="audit-writer",
+            daemon=True,
+        )
+        self._writer.start()
+    
+    def _flush_locked(self) -> None:
+        """Write buffered rows, one transaction per batch. Caller must hold the lock.
         
-        return entry
+        Writers append to _pending without the lock, but only at the end, so
+        slicing off the first n rows and deleting them is safe.
+        """
+        self._last_flush = time.monotonic()
+        pending = self._pending
+        while pending:
+            n = len(pending)
+            self._conn.executemany(_INSERT_SQL, pending[:n])
+            self._conn.commit()
+            del pending[:n]
     
     def set_transaction_context(self, tx_id: Optional[str], checkpoint_id: Optional[str] = None) -> None:
         """Set the current transaction context for subsequent logs."""
@@ -262,7 +623,8 @@ class AuditLog:
         
         Args:
             principal: Filter by principal
-            op: Filter by operation (supports prefix match with *)
+            op: Filter by operation (supports prefix match with *;
+                matching is case-sensitive)
             object_id: Filter by object ID
             tx_id: Filter by transaction ID
             since: Filter entries after this timestamp
@@ -272,16 +634,90 @@ class AuditLog:
         Returns:
             List of matching AuditEntry objects
         """
+        return list(self.query_iter(
+            principal=principal,
+            op=op,
+            object_id=object_id,
+            tx_id=tx_id,
+            since=since,
+            until=until,
+            limit=limit,
+        ))
+    
+    def query_iter(
+        self,
+        principal: Optional[str] = None,
+        op: Optional[str] = None,
+        object_id: Optional[str] = None,
+        tx_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 1000,
+    ) -> Iterator[AuditEntry]:
+        """Stream matching entries, fetching rows in batches.
+        
+        Takes the same filters as query(); only QUERY_BATCH_SIZE rows are
+        materialized at a time.
+        """
+        clauses, params = self._build_filters(principal, op, object_id, tx_id, since, until)
+        params.append(limit)
+        sql = self._statement(_SELECT_TEMPLATE, clauses)
+        
+        conn, guard = self._reader()
+        with guard:
+            cursor = conn.execute(sql, params)
+        
+        loads = json.loads
+        intern = sys.intern
+        while True:
+            with guard:
+                rows = cursor.fetchmany(QUERY_BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield AuditEntry(
+                    id=row[0],
+                    timestamp=row[1],
+                    op=intern(row[2]),
+                    principal=intern(row[3]),
+                    object=row[4],
+                    args=loads(row[5]),
+                    result=intern(row[6]),
+                    tx_id=row[7],
+                    checkpoint_id=row[8],
+                    provenance=Provenance(row[9]),
+                    correlation_id=row[10],
+                )
+    
+    @staticmethod
+    def _build_filters(
+        principal: Optional[str],
+        op: Optional[str],
+        object_id: Optional[str],
+        tx_id: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+    ) -> tuple[tuple[str, ...], list]:
+        """Build the WHERE conditions and parameters for query filters.
+        
+        An operation prefix ('tab.*') becomes a half-open range on op, which
+        SQLite serves from idx_audit_op; LIKE would not use the index.
+        Unlike LIKE, the range compares case-sensitively, so 'Tab.*' does
+        not match 'tab.read'.
+        """
         conditions = []
-        params = []
+        params: list = []
         
         if principal:
             conditions.append("principal = ?")
             params.append(principal)
         if op:
             if op.endswith("*"):
-                conditions.append("op LIKE ?")
-                params.append(op[:-1] + "%")
+                prefix = op[:-1]
+                if prefix:
+                    conditions.append("op >= ? AND op < ?")
+                    params.append(prefix)
+                    params.append(prefix[:-1] + chr(ord(prefix[-1]) + 1))
             else:
                 conditions.append("op = ?")
                 params.append(op)
@@ -298,43 +734,22 @@ class AuditLog:
             conditions.append("timestamp <= ?")
             params.append(until)
         
-        where = " AND ".join(conditions) if conditions else "1=1"
-        params.append(limit)
-        
-        with self._lock:
-            cursor = self._conn.execute(
-                f"""
-                SELECT id, timestamp, op, principal, object, args, result, 
-                       tx_id, checkpoint_id, provenance, correlation_id
-                FROM audit_log
-                WHERE {where}
-                ORDER BY timestamp ASC
-                LIMIT ?
-                """,
-                params,
-            )
-            rows = cursor.fetchall()
-        
-        return [
-            AuditEntry(
-                id=row[0],
-                timestamp=row[1],
-                op=row[2],
-                principal=row[3],
-                object=row[4],
-                args=json.loads(row[5]),
-                result=row[6],
-                tx_id=row[7],
-                checkpoint_id=row[8],
-                provenance=Provenance(row[9]),
-                correlation_id=row[10],
-            )
-            for row in rows
-        ]
+        return tuple(conditions), params
+    
+    def _statement(self, template: str, conditions: tuple[str, ...]) -> str:
+        """SQL for a template and filter shape, built once per shape."""
+        key = (template, conditions)
+        sql = self._stmt_cache.get(key)
+        if sql is None:
+            where = " AND ".join(conditions) if conditions else "1=1"
+            sql = self._stmt_cache[key] = template.format(where=where)
+        return sql
     
     def export_json(self, filepath: str | Path, **query_kwargs) -> int:
         """Export audit entries to a JSON file.
         
+        Entries are streamed from the database and written one at a time.
+        
         Args:
             filepath: Output file path
             **query_kwargs: Filters passed to query()
@@ -342,14 +757,41 @@ class AuditLog:
         Returns:
             Number of entries exported
         """
-        entries = self.query(**query_kwargs)
+        count = 0
         with open(filepath, "w") as f:
-            json.dump([e.to_dict() for e in entries], f, indent=2)
-        return len(entries)
+            f.write("[")
+            for entry in self.query_iter(**query_kwargs):
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(entry.to_dict(), indent=2))
+                count += 1
+            f.write("\n]" if count else "]")
+        return count
     
-    def count(self, **query_kwargs) -> int:
-        """Count entries matching the query."""
-        return len(self.query(**query_kwargs))
+    def count(
+        self,
+        principal: Optional[str] = None,
+        op: Optional[str] = None,
+        object_id: Optional[str] = None,
+        tx_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """Count entries matching the query (filters as in query()).
+        
+        Counting happens in SQL; no rows are materialized. Unlike query(),
+        the count is uncapped unless a limit is given.
+        """
+        clauses, params = self._build_filters(principal, op, object_id, tx_id, since, until)
+        if limit is None:
+            sql = self._statement(_COUNT_TEMPLATE, clauses)
+        else:
+            sql = self._statement(_COUNT_LIMITED_TEMPLATE, clauses)
+            params.append(limit)
+        
+        conn, guard = self._reader()
+        with guard:
+            return conn.execute(sql, params).fetchone()[0]
     
     def get_transaction_log(self, tx_id: str) -> list[AuditEntry]:
         """Get all log entries for a transaction."""
@@ -9,12 +9,66 @@ Every privileged operation requires an unforgeable capability token that binds:
 
 from __future__ import annotations
 
+import base64
+import functools
 import hashlib
-import secrets
+import heapq
+import os
+import threading
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from itertools import chain
+from typing import Callable, Iterator, Optional
+
+
+Matcher = Callable[[str, str], bool]
+
+# Memoized check results are trusted for at most this long, and never past
+# the expiry of the capability that allowed them. The memo is cleared on any
+# grant/revoke, and when it grows past CHECK_CACHE_MAX_ENTRIES.
+CHECK_CACHE_TTL_SECONDS = 1.0
+CHECK_CACHE_MAX_ENTRIES = 4096
+
+# Tokens carry TOKEN_BYTES of os.urandom entropy (same as token_urlsafe(32)).
+# Random bytes are read TOKEN_POOL_BYTES at a time to amortize the syscall.
+TOKEN_BYTES = 32
+TOKEN_POOL_BYTES = 4096
+
+# Compiled (operation, resource) matchers are shared by every capability with
+# the same patterns; this many distinct pattern pairs are kept.
+MATCHER_CACHE_SIZE = 4096
+
+
+def _compile_pattern(pattern: str, wildcard_suffix: str) -> Callable[[str], bool]:
+    """Classify a grant pattern once as ANY, PREFIX or EXACT and return its predicate."""
+    if pattern == "*":
+        return lambda value: True
+    if pattern.endswith(wildcard_suffix):
+        prefix = pattern[:-1]
+        return lambda value: value.startswith(prefix)
+    return pattern.__eq__
+
+
+def _op_bucket(operation: str) -> str:
+    """Leading namespace segment of an operation ('tab.read' -> 'tab', '*' -> '*')."""
+    return operation.split(".", 1)[0]
+
+
+@functools.lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def _compile_matcher(operation: str, resource: str) -> Matcher:
+    """Build a (operation, resource) predicate for a capability's patterns.
+    
+    Memoized per pattern pair, so each pattern is compiled once however
+    many capabilities or checks use it.
+    
+    Example:
+        >>> _compile_matcher("tab.*", "tab:*")("tab.read", "tab:42")
+        True
+    """
+    op_pred = _compile_pattern(operation, ".*")
+    res_pred = _compile_pattern(resource, ":*")
+    return lambda op, res: op_pred(op) and res_pred(res)
 
 
 class CapabilityRisk(Enum):
@@ -24,7 +78,7 @@ class CapabilityRisk(Enum):
     IRREVERSIBLE = "irreversible"  # High risk: submit, send, pay
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Capability:
     """An unforgeable token permitting a principal to perform an operation."""
     token: str
@@ -43,21 +97,7 @@ class Capability:
     
     def matches(self, operation: str, resource: str) -> bool:
         """Check if this capability grants the requested operation on resource."""
-        if self.operation == "*":
-            op_match = True
-        elif self.operation.endswith(".*"):
-            op_match = operation.startswith(self.operation[:-1])
-        else:
-            op_match = self.operation == operation
-        
-        if self.resource == "*":
-            res_match = True
-        elif self.resource.endswith(":*"):
-            res_match = resource.startswith(self.resource[:-1])
-        else:
-            res_match = self.resource == resource
-        
-        return op_match and res_match
+        return _compile_matcher(self.operation, self.resource)(operation, resource)
 
 
 @dataclass
@@ -76,13 +116,40 @@ class CapabilityBroker:
     """Validates every privileged operation and manages capability lifecycle."""
     
     def __init__(self, audit_log=None):
-        self._capabilities: dict[str, list[Capability]] = {}  # principal -> caps
+        self._capabilities: dict[str, dict[str, Capability]] = {}  # principal -> token -> cap
         self._tokens: dict[str, Capability] = {}  # token -> cap
+        # principal -> operation namespace ('tab', 'form', '*') -> token -> cap
+        self._by_principal_op: dict[str, dict[str, dict[str, Capability]]] = {}
+        # (principal, operation, resource) -> (matching cap or None, valid_until)
+        self._check_cache: dict[tuple[str, str, str], tuple[Optional[Capability], float]] = {}
+        # (expires_at, token) min-heap; expired caps are evicted lazily by check()
+        self._expiry_heap: list[tuple[float, str]] = []
+        # Bumped on every grant/revoke/eviction so callers can validate
+        # their own memoized results (see BrowserAPI._require_cap)
+        self._generation = 0
+        self._rng_pool = b""
+        self._rng_offset = 0
+        self._rng_pid = os.getpid()
+        self._rng_lock = threading.Lock()
         self._audit = audit_log
     
     def _generate_token(self) -> str:
-        """Generate an unforgeable capability token."""
-        return secrets.token_urlsafe(32)
+        """Generate an unforgeable capability token.
+        
+        Slices a pooled os.urandom read; bytes are never handed out twice,
+        and the pool is discarded in forked children so processes don't
+        share tokens.
+        """
+        with self._rng_lock:
+            pid = os.getpid()
+            if pid != self._rng_pid or self._rng_offset + TOKEN_BYTES > len(self._rng_pool):
+                self._rng_pool = os.urandom(TOKEN_POOL_BYTES)
+                self._rng_offset = 0
+                self._rng_pid = pid
+            start = self._rng_offset
+            self._rng_offset = start + TOKEN_BYTES
+            raw = self._rng_pool[start:start + TOKEN_BYTES]
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
     
     def grant(
         self,
@@ -119,10 +186,14 @@ class CapabilityBroker:
             expires_at=expires_at,
         )
         
-        if principal not in self._capabilities:
-            self._capabilities[principal] = []
-        self._capabilities[principal].append(cap)
+        self._capabilities.setdefault(principal, {})[token] = cap
         self._tokens[token] = cap
+        buckets = self._by_principal_op.setdefault(principal, {})
+        buckets.setdefault(_op_bucket(operation), {})[token] = cap
+        self._check_cache.clear()
+        self._generation += 1
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, token))
         
         if self._audit:
             self._audit.log(
@@ -135,12 +206,18 @@ class CapabilityBroker:
         
         return cap
     
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever any capability is granted or removed."""
+        return self._generation
+    
     def check(
         self,
         principal: str,
         operation: str,
         resource: str,
         raise_on_deny: bool = False,
+        log_allowed: bool = True,
     ) -> bool:
         """Check if principal has capability for operation on resource.
         
@@ -149,6 +226,9 @@ class CapabilityBroker:
             operation: Requested operation
             resource: Target resource
             raise_on_deny: If True, raise CapabilityDenied instead of returning False
+            log_allowed: If False, an allowed check writes no capability.check
+                entry (the caller records the capability in its own entry).
+                Denials are always logged.
             
         Returns:
             True if permitted, False otherwise
@@ -156,34 +236,107 @@ class CapabilityBroker:
         Raises:
             CapabilityDenied: If raise_on_deny=True and check fails
         """
-        caps = self._capabilities.get(principal, [])
-        
-        for cap in caps:
-            if cap.is_expired():
-                continue
-            if cap.matches(operation, resource):
-                if self._audit:
-                    self._audit.log(
-                        op="capability.check",
-                        principal=principal,
-                        object=resource,
-                        args={"operation": operation},
-                        result="allowed",
-                    )
-                return True
+        return self._match(principal, operation, resource, raise_on_deny, log_allowed) is not None
+    
+    def _match(
+        self,
+        principal: str,
+        operation: str,
+        resource: str,
+        raise_on_deny: bool,
+        log_allowed: bool,
+    ) -> Optional[Capability]:
+        """Resolve, audit and return the capability permitting the request."""
+        key = (principal, operation, resource)
+        now = time.time()
+        if self._expiry_heap and self._expiry_heap[0][0] < now:
+            self._evict_expired(now)
+        cached = self._check_cache.get(key)
+        if cached is not None and now < cached[1]:
+            cap = cached[0]
+        else:
+            cap, valid_until = self._evaluate(principal, operation, resource, now)
+            if len(self._check_cache) >= CHECK_CACHE_MAX_ENTRIES:
+                self._check_cache.clear()
+            self._check_cache[key] = (cap, valid_until)
         
-        if self._audit:
-            self._audit.log(
+        if self._audit and (cap is None or log_allowed):
+            # Allowed checks are high-volume and take the non-blocking path;
+            # denials are flushed to disk before returning, for forensic
+            # reliability (log() alone only writes once the buffer is due).
+            log = self._audit.log if cap is None else self._audit.log_async
+            log(
                 op="capability.check",
                 principal=principal,
                 object=resource,
                 args={"operation": operation},
-                result="denied",
+                result="denied" if cap is None else "allowed",
             )
+            if cap is None:
+                self._audit.flush()
         
-        if raise_on_deny:
+        if cap is None and raise_on_deny:
             raise CapabilityDenied(principal, operation, resource)
-        return False
+        return cap
+    
+    def _evaluate(
+        self, principal: str, operation: str, resource: str, now: float
+    ) -> tuple[Optional[Capability], float]:
+        """Scan candidate capabilities; returns (matching cap, cache valid_until).
+        
+        Expired capabilities have already been evicted by check().
+        """
+        valid_until = now + CHECK_CACHE_TTL_SECONDS
+        for cap in self._candidates(principal, operation):
+            if cap.matches(operation, resource):
+                if cap.expires_at is not None:
+                    valid_until = min(valid_until, cap.expires_at)
+                return cap, valid_until
+        return None, valid_until
+    
+    def _evict_expired(self, now: float) -> None:
+        """Drop every capability whose expiry has passed (no audit entry)."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, token = heapq.heappop(heap)
+            self._discard(token)  # no-op if already revoked
+    
+    def _discard(self, token: str) -> Optional[Capability]:
+        """Remove a capability from every index; returns it, or None if unknown."""
+        cap = self._tokens.pop(token, None)
+        if cap is None:
+            return None
+        self._generation += 1
+        self._capabilities.get(cap.principal, {}).pop(token, None)
+        
+        # Prune empty buckets so bucket keys stay an exact "covered namespaces" set
+        buckets = self._by_principal_op.get(cap.principal, {})
+        namespace = _op_bucket(cap.operation)
+        bucket = buckets.get(namespace, {})
+        bucket.pop(token, None)
+        if not bucket:
+            buckets.pop(namespace, None)
+        if not buckets:
+            self._by_principal_op.pop(cap.principal, None)
+        return cap
+    
+    def _candidates(self, principal: str, operation: str) -> Iterator[Capability]:
+        """Capabilities that could match: same operation namespace or '*'.
+        
+        A principal whose grants cover neither namespace is rejected with two
+        dict lookups, without touching any capability.
+        """
+        buckets = self._by_principal_op.get(principal)
+        if not buckets:
+            return iter(())
+        in_namespace = buckets.get(_op_bucket(operation))
+        anywhere = buckets.get("*")
+        if in_namespace is None and anywhere is None:
+            return iter(())
+        return chain(
+            in_namespace.values() if in_namespace else (),
+            anywhere.values() if anywhere else (),
+        )
     
     def revoke(self, token: str) -> bool:
         """Revoke a capability by its token.
@@ -191,14 +344,10 @@ class CapabilityBroker:
         Returns:
             True if revoked, False if token not found
         """
-        cap = self._tokens.pop(token, None)
+        cap = self._discard(token)
         if cap is None:
             return False
-        
-        if cap.principal in self._capabilities:
-            self._capabilities[cap.principal] = [
-                c for c in self._capabilities[cap.principal] if c.token != token
-            ]
+        self._check_cache.clear()
         
         if self._audit:
             self._audit.log(
@@ -217,7 +366,10 @@ class CapabilityBroker:
         Returns:
             Number of capabilities revoked
         """
-        caps = self._capabilities.pop(principal, [])
+        caps = self._capabilities.pop(principal, {}).values()
+        self._by_principal_op.pop(principal, None)
+        self._check_cache.clear()
+        self._generation += 1
         count = len(caps)
         
         for cap in caps:
@@ -236,8 +388,22 @@ class CapabilityBroker:
     
     def list_capabilities(self, principal: str) -> list[Capability]:
         """List all non-expired capabilities for a principal."""
-        return [c for c in self._capabilities.get(principal, []) if not c.is_expired()]
+        return [c for c in self._capabilities.get(principal, {}).values() if not c.is_expired()]
     
-    def require(self, principal: str, operation: str, resource: str) -> None:
-        """Check capability and raise if denied. Convenience wrapper."""
-        self.check(principal, operation, resource, raise_on_deny=True)
+    def require(
+        self,
+        principal: str,
+        operation: str,
+        resource: str,
+        log_allowed: bool = True,
+    ) -> Capability:
+        """Check capability and raise if denied. Convenience wrapper.
+        
+        Returns:
+            The capability that permits the operation
+        
+        Example:
+            cap = broker.require("agent:1", "tab.close", "tab:42", log_allowed=False)
+            audit.log("tab.close", "agent:1", "tab:42", {"capability": f"cap:{cap.token[:8]}"})
+        """
+        return self._match(principal, operation, resource, True, log_allowed)
@@ -14,13 +14,15 @@ to exercise the kernel's semantics.
 from __future__ import annotations
 
 import re
+import sys
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 from urllib.parse import urlparse
 
-from kernel.objects import ObjectManager, ObjectType, Tab, Form
+from kernel.objects import ObjectManager, ObjectType, _fast_clone
 from kernel.audit import AuditLog, Provenance
 
 
@@ -32,6 +34,32 @@ class LoadState(Enum):
     COMPLETE = "complete"
 
 
+# Plain-string load states written into tab data on the navigation path;
+# resolved once so navigate skips the Enum.value descriptor.
+_LOADING = LoadState.LOADING.value
+_COMPLETE = LoadState.COMPLETE.value
+
+
+def _frozen_fields(fields: dict[str, dict]) -> Mapping[str, Mapping]:
+    """Wrap a field-spec template in read-only views so forms can share it."""
+    return MappingProxyType({name: MappingProxyType(spec) for name, spec in fields.items()})
+
+
+# Field specs for the standard forms, shared by every MockForm built from them
+_LOGIN_FIELDS = _frozen_fields({
+    "email": {"type": "email", "required": True, "label": "Email"},
+    "password": {"type": "password", "required": True, "label": "Password"},
+})
+_SEARCH_FIELDS = _frozen_fields({
+    "q": {"type": "text", "required": True, "label": "Search"},
+})
+_CONTACT_FIELDS = _frozen_fields({
+    "name": {"type": "text", "required": True, "label": "Name"},
+    "email": {"type": "email", "required": True, "label": "Email"},
+    "message": {"type": "textarea", "required": True, "label": "Message"},
+})
+
+
 @dataclass
 class MockForm:
     """A simulated form on a page."""
@@ -39,7 +67,7 @@ class MockForm:
     form_type: str
     action: str
     method: str = "POST"
-    fields: dict[str, dict] = field(default_factory=dict)
+    fields: Mapping[str, Mapping] = field(default_factory=dict)
     
     @classmethod
     def login_form(cls, form_id: str) -> "MockForm":
@@ -48,10 +76,7 @@ class MockForm:
             id=form_id,
             form_type="login",
             action="/login",
-            fields={
-                "email": {"type": "email", "required": True, "label": "Email"},
-                "password": {"type": "password", "required": True, "label": "Password"},
-            },
+            fields=_LOGIN_FIELDS,
         )
     
     @classmethod
@@ -62,9 +87,7 @@ class MockForm:
             form_type="search",
             action="/search",
             method="GET",
-            fields={
-                "q": {"type": "text", "required": True, "label": "Search"},
-            },
+            fields=_SEARCH_FIELDS,
         )
     
     @classmethod
@@ -74,11 +97,7 @@ class MockForm:
             id=form_id,
             form_type="contact",
             action="/contact",
-            fields={
-                "name": {"type": "text", "required": True, "label": "Name"},
-                "email": {"type": "email", "required": True, "label": "Email"},
-                "message": {"type": "textarea", "required": True, "label": "Message"},
-            },
+            fields=_CONTACT_FIELDS,
         )
 
 
@@ -92,6 +111,11 @@ class MockPage:
     links: list[dict] = field(default_factory=list)
     tables: list[dict] = field(default_factory=list)
     load_time_ms: float = 100.0
+    word_count: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        # Pages are read-only once built, so count words once up front
+        self.word_count = len(self.content.split())
     
     def extract_readable(self) -> dict:
         """Extract readable content."""
@@ -100,7 +124,7 @@ class MockPage:
             "url": self.url,
             "title": self.title,
             "content": self.content,
-            "word_count": len(self.content.split()),
+            "word_count": self.word_count,
         }
     
     def extract_forms(self) -> list[dict]:
@@ -117,81 +141,75 @@ class MockPage:
         ]
     
     def extract_links(self) -> list[dict]:
-        """Extract links."""
-        return self.links
+        """Extract links (a copy: default pages are shared by every renderer)."""
+        return _fast_clone(self.links)
     
     def extract_tables(self) -> list[dict]:
-        """Extract tables."""
-        return self.tables
+        """Extract tables (a copy: default pages are shared by every renderer)."""
+        return _fast_clone(self.tables)
 
 
-class MockSiteRegistry:
-    """Registry of mock sites with their pages."""
-    
-    def __init__(self):
-        self._sites: dict[str, dict[str, MockPage]] = {}
-        self._register_default_sites()
-    
-    def _register_default_sites(self) -> None:
-        """Register default mock sites for testing."""
-        
-        # Example.com - basic site
-        self.register_page(MockPage(
-            url="https://example.com/",
-            title="Example Domain",
-            content="This domain is for use in illustrative examples in documents.",
-            links=[
-                {"text": "More information...", "href": "https://www.iana.org/domains/example"},
-            ],
-        ))
-        
-        # Example.com login page
-        login_form = MockForm.login_form("form:login")
-        self.register_page(MockPage(
-            url="https://example.com/login",
-            title="Login - Example",
-            content="Please log in to continue.",
-            forms=[login_form],
-        ))
-        
-        # Example.com dashboard (post-login)
-        self.register_page(MockPage(
-            url="https://example.com/dashboard",
-            title="Dashboard - Example",
-            content="Welcome back! Here's your dashboard.",
-            links=[
-                {"text": "Settings", "href": "/settings"},
-                {"text": "Profile", "href": "/profile"},
-                {"text": "Logout", "href": "/logout"},
-            ],
-        ))
-        
-        # Search engine
-        search_form = MockForm.search_form("form:search")
-        self.register_page(MockPage(
-            url="https://search.example.com/",
-            title="Example Search",
-            content="Search the web.",
-            forms=[search_form],
-        ))
-        
-        # Search results
-        self.register_page(MockPage(
-            url="https://search.example.com/results",
-            title="Search Results - Example Search",
-            content="Results for your query.",
-            links=[
-                {"text": "Result 1", "href": "https://result1.example.com"},
-                {"text": "Result 2", "href": "https://result2.example.com"},
-                {"text": "Result 3", "href": "https://result3.example.com"},
-            ],
-        ))
-        
-        # Documentation site
-        self.register_page(MockPage(
-            url="https://docs.example.com/",
-            title="Documentation",
-            content="""
+def _default_pages() -> list[MockPage]:
+    """Build the default mock sites used for testing."""
+    pages: list[MockPage] = []
+    
+    # Example.com - basic site
+    pages.append(MockPage(
+        url="https://example.com/",
+        title="Example Domain",
+        content="This domain is for use in illustrative examples in documents.",
+        links=[
+            {"text": "More information...", "href": "https://www.iana.org/domains/example"},
+        ],
+    ))
+    
+    # Example.com login page
+    login_form = MockForm.login_form("form:login")
+    pages.append(MockPage(
+        url="https://example.com/login",
+        title="Login - Example",
+        content="Please log in to continue.",
+        forms=[login_form],
+    ))
+    
+    # Example.com dashboard (post-login)
+    pages.append(MockPage(
+        url="https://example.com/dashboard",
+        title="Dashboard - Example",
+        content="Welcome back! Here's your dashboard.",
+        links=[
+            {"text": "Settings", "href": "/settings"},
+            {"text": "Profile", "href": "/profile"},
+            {"text": "Logout", "href": "/logout"},
+        ],
+    ))
+    
+    # Search engine
+    search_form = MockForm.search_form("form:search")
+    pages.append(MockPage(
+        url="https://search.example.com/",
+        title="Example Search",
+        content="Search the web.",
+        forms=[search_form],
+    ))
+    
+    # Search results
+    pages.append(MockPage(
+        url="https://search.example.com/results",
+        title="Search Results - Example Search",
+        content="Results for your query.",
+        links=[
+            {"text": "Result 1", "href": "https://result1.example.com"},
+            {"text": "Result 2", "href": "https://result2.example.com"},
+            {"text": "Result 3", "href": "https://result3.example.com"},
+        ],
+    ))
+    
+    # Documentation site
+    pages.append(MockPage(
+        url="https://docs.example.com/",
+        title="Documentation",
+        content="""
 # Getting Started
 
 Welcome to the documentation.
@@ -210,45 +228,83 @@ example.do_thing()
 ## API Reference
 
 See the API docs for more details.
-            """.strip(),
-            links=[
-                {"text": "Installation", "href": "/installation"},
-                {"text": "API Reference", "href": "/api"},
-                {"text": "Examples", "href": "/examples"},
-            ],
-        ))
-        
-        # Contact page
-        contact_form = MockForm.contact_form("form:contact")
-        self.register_page(MockPage(
-            url="https://example.com/contact",
-            title="Contact Us - Example",
-            content="Get in touch with our team.",
-            forms=[contact_form],
-        ))
-        
-        # Data table page
-        self.register_page(MockPage(
-            url="https://data.example.com/",
-            title="Data Table",
-            content="Sample data table.",
-            tables=[
-                {
-                    "headers": ["Name", "Email", "Status"],
-                    "rows": [
-                        ["Alice", "alice@example.com", "Active"],
-                        ["Bob", "bob@example.com", "Pending"],
-                        ["Charlie", "charlie@example.com", "Active"],
-                    ],
-                },
-            ],
-        ))
+        """.strip(),
+        links=[
+            {"text": "Installation", "href": "/installation"},
+            {"text": "API Reference", "href": "/api"},
+            {"text": "Examples", "href": "/examples"},
+        ],
+    ))
+    
+    # Contact page
+    contact_form = MockForm.contact_form("form:contact")
+    pages.append(MockPage(
+        url="https://example.com/contact",
+        title="Contact Us - Example",
+        content="Get in touch with our team.",
+        forms=[contact_form],
+    ))
+    
+    # Data table page
+    pages.append(MockPage(
+        url="https://data.example.com/",
+        title="Data Table",
+        content="Sample data table.",
+        tables=[
+            {
+                "headers": ["Name", "Email", "Status"],
+                "rows": [
+                    ["Alice", "alice@example.com", "Active"],
+                    ["Bob", "bob@example.com", "Pending"],
+                    ["Charlie", "charlie@example.com", "Active"],
+                ],
+            },
+        ],
+    ))
+    
+    return pages
+
+
+# scheme://host/path, stopping at any query or fragment - the only URL shape
+# the registry needs to key on. Anything else (including ;params, which
+# urlparse strips from the path) falls back to urlparse.
+_URL_RE = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*://([^/?#]*)([^?#;]*)(?:[?#]|$)")
+
+
+def _split_url(url: str) -> tuple[str, str]:
+    """Split a URL into the (host, path) key used by the site registry."""
+    m = _URL_RE.match(url)
+    if m is None:
+        parsed = urlparse(url)
+        return parsed.netloc, parsed.path or "/"
+    return m.group(1), m.group(2) or "/"
+
+
+def _index_pages(pages: list[MockPage]) -> dict[str, dict[str, MockPage]]:
+    """Group pages by host, then path."""
+    sites: dict[str, dict[str, MockPage]] = {}
+    for page in pages:
+        host, path = _split_url(page.url)
+        sites.setdefault(host, {})[path] = page
+    return sites
+
+
+# Default pages are built once at import and shared by every registry.
+# They are treated as read-only; registries copy only the host -> path maps.
+_DEFAULT_SITES = _index_pages(_default_pages())
+
+
+class MockSiteRegistry:
+    """Registry of mock sites with their pages."""
+    
+    def __init__(self):
+        self._sites: dict[str, dict[str, MockPage]] = {
+            host: dict(paths) for host, paths in _DEFAULT_SITES.items()
+        }
     
     def register_page(self, page: MockPage) -> None:
         """Register a mock page."""
-        parsed = urlparse(page.url)
-        host = parsed.netloc
-        path = parsed.path or "/"
+        host, path = _split_url(page.url)
         
         if host not in self._sites:
             self._sites[host] = {}
@@ -256,9 +312,7 @@ See the API docs for more details.
     
     def get_page(self, url: str) -> Optional[MockPage]:
         """Get a mock page by URL."""
-        parsed = urlparse(url)
-        host = parsed.netloc
-        path = parsed.path or "/"
+        host, path = _split_url(url)
         
         site = self._sites.get(host, {})
         return site.get(path)
@@ -273,23 +327,36 @@ See the API docs for more details.
         )
 
 
+# extract_type -> extractor, so MockRenderer.extract dispatches in one lookup
+_EXTRACTORS: dict[str, Callable[[MockPage], dict]] = {
+    "readable": lambda page: page.extract_readable(),
+    "forms": lambda page: {"forms": page.extract_forms()},
+    "links": lambda page: {"links": page.extract_links()},
+    "tables": lambda page: {"tables": page.extract_tables()},
+}
+
+
 class MockRenderer:
     """Mock renderer that simulates web page loading and interaction.
     
     Integrates with the kernel's ObjectManager to update Tab and Form
     objects as navigation and form interactions occur.
+    
+    Navigation is instant by default; pass simulate_latency=True to sleep
+    for each page's load_time_ms.
     """
     
     def __init__(
         self,
         objects: ObjectManager,
         audit: Optional[AuditLog] = None,
+        simulate_latency: bool = False,
     ):
         self._objects = objects
         self._audit = audit
+        self._simulate_latency = simulate_latency
         self._registry = MockSiteRegistry()
         self._tab_pages: dict[str, MockPage] = {}  # tab_id -> current page
-        self._form_data: dict[str, dict] = {}  # form_id -> filled data
         self._submit_callback: Optional[Callable[[str, dict], dict]] = None
     
     def set_submit_callback(self, callback: Callable[[str, dict], dict]) -> None:
@@ -307,25 +374,25 @@ class MockRenderer:
             Navigation result with page info
         """
         tab = self._objects.get(tab_id)
-        if not tab or not isinstance(tab, Tab):
+        if tab is None or tab._type is not ObjectType.TAB:
             return {"success": False, "error": f"Tab not found: {tab_id}"}
         
         # Update tab state
         tab._data["url"] = url
-        tab._data["load_state"] = LoadState.LOADING.value
-        tab._updated_at = time.time()
+        tab._data["load_state"] = _LOADING
         
         # Get mock page
         page = self._registry.get_page(url)
         if not page:
             page = self._registry.generate_404(url)
         
-        # Simulate load time
-        time.sleep(page.load_time_ms / 1000)
+        # Simulate load time (opt-in; load_time_ms is reported either way)
+        if self._simulate_latency:
+            time.sleep(page.load_time_ms / 1000)
         
         # Update tab with page data
         tab._data["title"] = page.title
-        tab._data["load_state"] = LoadState.COMPLETE.value
+        tab._data["load_state"] = _COMPLETE
         tab._updated_at = time.time()
         
         # Store page reference
@@ -333,7 +400,7 @@ class MockRenderer:
         
         # Log navigation
         if self._audit:
-            self._audit.log(
+            self._audit.log_async(
                 op="renderer.navigate",
                 principal="renderer",
                 object=tab_id,
@@ -358,8 +425,8 @@ class MockRenderer:
         if not tab:
             return False
         
-        # Mock: just set the state
-        tab._data["load_state"] = state
+        # Mock: just set the state (interned: states come from a small set)
+        tab._data["load_state"] = sys.intern(state)
         return True
     
     def extract(self, tab_id: str, extract_type: str = "readable") -> dict:
@@ -376,16 +443,10 @@ class MockRenderer:
         if not page:
             return {"error": f"No page loaded for tab {tab_id}"}
         
-        if extract_type == "readable":
-            return page.extract_readable()
-        elif extract_type == "forms":
-            return {"forms": page.extract_forms()}
-        elif extract_type == "links":
-            return {"links": page.extract_links()}
-        elif extract_type == "tables":
-            return {"tables": page.extract_tables()}
-        else:
+        extractor = _EXTRACTORS.get(extract_type)
+        if extractor is None:
             return {"error": f"Unknown extract type: {extract_type}"}
+        return extractor(page)
     
     def find_form(self, tab_id: str, form_type: str = "") -> Optional[str]:
         """Find a form on a page.
@@ -409,15 +470,13 @@ class MockRenderer:
                     tab_id=tab_id,
                     form_type=mock_form.form_type,
                 )
-                form._data["fields"] = mock_form.fields
+                # Pages are shared across renderers; give the form its own copy
+                form._data["fields"] = {name: dict(spec) for name, spec in mock_form.fields.items()}
                 form._data["action"] = mock_form.action
                 form._data["method"] = mock_form.method
                 
-                # Track filled data separately
-                self._form_data[form.id] = {}
-                
                 if self._audit:
-                    self._audit.log(
+                    self._audit.log_async(
                         op="renderer.find_form",
                         principal="renderer",
                         object=form.id,
@@ -441,20 +500,15 @@ class MockRenderer:
             Fill result
         """
         form = self._objects.get(form_id)
-        if not form or not isinstance(form, Form):
+        if form is None or form._type is not ObjectType.FORM:
             return {"success": False, "error": f"Form not found: {form_id}"}
         
-        # Store filled values
-        if form_id not in self._form_data:
-            self._form_data[form_id] = {}
-        self._form_data[form_id].update(values)
-        
-        # Update form object
-        form._data["filled"] = dict(self._form_data[form_id])
+        # The form object is the single source of truth for filled values
+        form._data.setdefault("filled", {}).update(values)
         form._updated_at = time.time()
         
         if self._audit:
-            self._audit.log(
+            self._audit.log_async(
                 op="renderer.fill_form",
                 principal="renderer",
                 object=form_id,
@@ -468,10 +522,9 @@ class MockRenderer:
     def clear_form(self, form_id: str) -> dict:
         """Clear form fields."""
         form = self._objects.get(form_id)
-        if not form:
+        if form is None or form._type is not ObjectType.FORM:
             return {"success": False, "error": f"Form not found: {form_id}"}
         
-        self._form_data[form_id] = {}
         form._data["filled"] = {}
         form._updated_at = time.time()
         
@@ -487,13 +540,15 @@ class MockRenderer:
             Submission result
         """
         form = self._objects.get(form_id)
-        if not form:
+        if form is None or form._type is not ObjectType.FORM:
             return {"success": False, "error": f"Form not found: {form_id}"}
         
-        filled = self._form_data.get(form_id, {})
+        filled = form._data.get("filled", {})
         action = form._data.get("action", "/")
         method = form._data.get("method", "POST")
         
+        # Irreversible: stays on the synchronous log, unlike the
+        # bookkeeping events above which are buffered via log_async
         if self._audit:
             self._audit.log(
                 op="renderer.submit_form",
@@ -4,35 +4,97 @@ The runtime:
 - Only exposes the `browser` API
 - Blocks dangerous imports (os, socket, subprocess, etc.)
 - Enforces timeouts and resource limits
-- Communicates with the kernel via IPC (JSON over Unix sockets)
+- Communicates with the kernel via IPC (length-prefixed JSON over Unix sockets)
 """
 
 from __future__ import annotations
 
 import ast
+import copy
+import hashlib
 import json
+import os
+import queue
+import re
+import selectors
 import socket
+import struct
+import sys
 import threading
 import time
-import traceback
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from types import CodeType
 from typing import Any, Callable, Optional
 
-from kernel.capabilities import CapabilityBroker, CapabilityDenied
+from kernel.capabilities import (
+    CHECK_CACHE_MAX_ENTRIES,
+    Capability,
+    CapabilityBroker,
+    CapabilityDenied,
+)
 from kernel.objects import ObjectManager, Tab, Form, Workspace, ObjectType
 from kernel.audit import AuditLog, Provenance
-from kernel.transactions import TransactionCoordinator
+from kernel.transactions import TransactionContext, TransactionCoordinator
 
 
-BLOCKED_IMPORTS = frozenset({
+BLOCKED_IMPORTS = frozenset(sys.intern(name) for name in (
     "os", "sys", "subprocess", "socket", "requests", "urllib",
     "http", "ftplib", "smtplib", "telnetlib", "ssl", "asyncio",
     "multiprocessing", "threading", "ctypes", "importlib",
     "builtins", "__builtins__", "eval", "exec", "compile",
     "open", "file", "input", "breakpoint",
-})
+))
+
+# Builtins exposed to agent code. Copied per execution (a single C-level dict
+# copy) rather than shared, so one script can't tamper with another's builtins.
+_SAFE_BUILTINS: dict[str, Any] = {
+    "print": print,
+    "len": len,
+    "range": range,
+    "enumerate": enumerate,
+    "zip": zip,
+    "map": map,
+    "filter": filter,
+    "list": list,
+    "dict": dict,
+    "set": set,
+    "tuple": tuple,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "True": True,
+    "False": False,
+    "None": None,
+    "isinstance": isinstance,
+    "hasattr": hasattr,
+    "getattr": getattr,
+}
+
+# Compiled agent programs cached per runtime, keyed by a digest of the source
+# so the cache never pins large source strings.
+CODE_CACHE_SIZE = 512
+
+# Filename reported in tracebacks from agent code
+AGENT_FILENAME = "<agent>"
+
+CompiledCode = tuple[Optional[CodeType], tuple[str, ...]]
+
+# Upper bound on agent-execution worker threads per runtime. Idle workers are
+# reused, so the pool only grows under concurrent executions - or when
+# timed-out scripts (which cannot be killed) keep holding their worker. When
+# every worker is busy, execute() fails fast with RuntimeSaturated rather
+# than queueing the script behind them.
+EXECUTION_WORKERS = 32
+
+# BrowserAPI instances are cached weakly per principal; this many of the most
+# recently created ones are also held strongly so they survive between calls.
+RECENT_API_COUNT = 64
 
 
 class ExecutionState(Enum):
@@ -56,25 +118,60 @@ class ExecutionResult:
     operations: list[dict] = field(default_factory=list)
 
 
-class ImportValidator(ast.NodeVisitor):
-    """AST visitor to validate imports."""
-    
-    def __init__(self):
-        self.violations: list[str] = []
+# Every import statement contains the `import` keyword. Keywords are ASCII-only
+# tokens, so ASCII source without this word cannot contain an Import or
+# ImportFrom node and skips the AST walk.
+_IMPORT_KEYWORD_RE = re.compile(r"\bimport\b")
+
+
+def _find_blocked_imports(tree: ast.AST, source: Optional[str] = None) -> list[str]:
+    """Collect blocked-import violations in a parsed module.
     
-    def visit_Import(self, node: ast.Import) -> None:
-        for alias in node.names:
-            module = alias.name.split(".")[0]
-            if module in BLOCKED_IMPORTS:
-                self.violations.append(f"Blocked import: {alias.name}")
-        self.generic_visit(node)
+    Args:
+        tree: Parsed module
+        source: The source it was parsed from, enabling the keyword prefilter
+    """
+    if source is not None and source.isascii() and not _IMPORT_KEYWORD_RE.search(source):
+        return []
+    violations: list[str] = []
+    # Exact type tests: no AST subclasses Import/ImportFrom
+    for node in ast.walk(tree):
+        cls = type(node)
+        if cls is ast.Import:
+            for alias in node.names:
+                if alias.name.partition(".")[0] in BLOCKED_IMPORTS:
+                    violations.append(f"Blocked import: {alias.name}")
+        elif cls is ast.ImportFrom:
+            module = node.module
+            if module and module.partition(".")[0] in BLOCKED_IMPORTS:
+                violations.append(f"Blocked import: from {module}")
+    return violations
+
+
+_DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _strip_docstrings(tree: ast.Module) -> None:
+    """Drop docstrings in place so they aren't stored in the code objects.
     
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        if node.module:
-            module = node.module.split(".")[0]
-            if module in BLOCKED_IMPORTS:
-                self.violations.append(f"Blocked import: from {node.module}")
-        self.generic_visit(node)
+    This is the docstring half of optimize=2. Asserts are kept because agent
+    code may rely on them failing, and constant `if False:` branches need no
+    pass since the compiler already drops them.
+    """
+    for node in ast.walk(tree):
+        if not isinstance(node, _DOCSTRING_OWNERS):
+            continue
+        body = node.body
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            if len(body) > 1:
+                del body[0]
+            else:
+                body[0] = ast.copy_location(ast.Pass(), body[0])
 
 
 class BrowserAPI:
@@ -97,6 +194,8 @@ class BrowserAPI:
         self._objects = objects
         self._audit = audit
         self._transactions = transactions
+        # (operation, resource) -> (broker generation, permitting capability)
+        self._cap_cache: dict[tuple[str, str], tuple[int, Capability]] = {}
         
         # Expose sub-APIs
         self.Tab = TabAPI(self)
@@ -105,13 +204,64 @@ class BrowserAPI:
         self.human = HumanAPI(self)
         self.Audit = AuditAPI(self)
     
-    def _require_cap(self, operation: str, resource: str) -> None:
-        """Check capability and raise if denied."""
-        self._caps.require(self._principal, operation, resource)
+    def _for_execution(self) -> "BrowserAPI":
+        """A per-execution view of this API with its own HumanAPI.
+        
+        The view shares the capability memo with this instance, but
+        approval settings made by one script don't reach the next.
+        """
+        api = copy.copy(self)
+        api.human = HumanAPI(api)
+        return api
     
-    def _log(self, op: str, obj: str, args: dict, result: str) -> None:
-        """Log an operation."""
-        self._audit.log(
+    def _require_cap(self, operation: str, resource: str, log_check: bool = True) -> Capability:
+        """Check capability and raise if denied.
+        
+        With log_check=False an allowed check writes no capability.check
+        entry; pass the returned capability to _log() so the operation's own
+        entry records it instead (one row per op rather than two).
+        
+        Those unlogged grants are memoized per (operation, resource) and
+        reused while the broker's generation is unchanged and the capability
+        has not expired. Logged checks always go to the broker so every one
+        still writes its capability.check entry.
+        """
+        if log_check:
+            return self._caps.require(self._principal, operation, resource)
+        key = (operation, resource)
+        cached = self._cap_cache.get(key)
+        if cached is not None:
+            generation, cap = cached
+            if generation == self._caps.generation and (
+                cap.expires_at is None or time.time() < cap.expires_at
+            ):
+                return cap
+        generation = self._caps.generation
+        cap = self._caps.require(self._principal, operation, resource, log_allowed=False)
+        if len(self._cap_cache) >= CHECK_CACHE_MAX_ENTRIES:
+            self._cap_cache.clear()
+        self._cap_cache[key] = (generation, cap)
+        return cap
+    
+    def _log(
+        self,
+        op: str,
+        obj: str,
+        args: dict,
+        result: str,
+        cap: Optional[Capability] = None,
+        sync: bool = False,
+    ) -> None:
+        """Log an operation, tagged with the capability that permitted it.
+        
+        Entries are buffered via AuditLog.log_async so flushes never run on
+        the agent's thread; AgentRuntime.execute flushes once the script
+        returns. Pass sync=True for irreversible operations.
+        """
+        if cap is not None:
+            args = {**args, "capability": f"cap:{cap.token[:8]}"}
+        log = self._audit.log if sync else self._audit.log_async
+        log(
             op=op,
             principal=self._principal,
             object=obj,
@@ -120,9 +270,8 @@ class BrowserAPI:
             provenance=Provenance.AGENT,
         )
     
-    def transaction(self) -> "TransactionContext":
+    def transaction(self) -> TransactionContext:
         """Begin a new transaction."""
-        from kernel.transactions import TransactionContext
         return self._transactions.begin()
 
 
@@ -134,9 +283,9 @@ class TabAPI:
     
     def open(self, url: str, workspace: Optional[str] = None) -> Tab:
         """Open a new tab."""
-        self._b._require_cap("tab.create", "*")
+        cap = self._b._require_cap("tab.create", "*", log_check=False)
         tab = self._b._objects.create(ObjectType.TAB, url=url)
-        self._b._log("tab.open", tab.id, {"url": url}, "success")
+        self._b._log("tab.open", tab.id, {"url": url}, "success", cap)
         return tab
     
     def get(self, tab_id: str) -> Tab:
@@ -150,21 +299,22 @@ class TabAPI:
     def list(self) -> list[Tab]:
         """List all tabs."""
         self._b._require_cap("tab.list", "*")
-        return [t for t in self._b._objects.list_by_type(ObjectType.TAB) if isinstance(t, Tab)]
+        # The type index only ever holds Tab instances for ObjectType.TAB
+        return self._b._objects.list_by_type(ObjectType.TAB)
     
     def close(self, tab_id: str) -> bool:
         """Close a tab."""
-        self._b._require_cap("tab.close", tab_id)
+        cap = self._b._require_cap("tab.close", tab_id, log_check=False)
         result = self._b._objects.delete(tab_id)
-        self._b._log("tab.close", tab_id, {}, "success" if result else "not_found")
+        self._b._log("tab.close", tab_id, {}, "success" if result else "not_found", cap)
         return result
     
     def navigate(self, tab_id: str, url: str) -> None:
         """Navigate a tab to a URL."""
-        self._b._require_cap("tab.navigate", tab_id)
+        cap = self._b._require_cap("tab.navigate", tab_id, log_check=False)
         tab = self.get(tab_id)
         tab.navigate(url)
-        self._b._log("tab.navigate", tab_id, {"url": url}, "success")
+        self._b._log("tab.navigate", tab_id, {"url": url}, "success", cap)
     
     def wait_for(self, tab_id: str, state: str = "interactive") -> None:
         """Wait for tab to reach a load state."""
@@ -193,10 +343,10 @@ class FormAPI:
     
     def find(self, tab_id: str, form_type: str = "") -> Form:
         """Find a form in a tab."""
-        self._b._require_cap("form.read", f"{tab_id}:*")
+        cap = self._b._require_cap("form.read", f"{tab_id}:*", log_check=False)
         # Create a mock form
         form = self._b._objects.create(ObjectType.FORM, tab_id=tab_id, form_type=form_type)
-        self._b._log("form.find", form.id, {"tab_id": tab_id, "type": form_type}, "found")
+        self._b._log("form.find", form.id, {"tab_id": tab_id, "type": form_type}, "found", cap)
         return form
     
     def get(self, form_id: str) -> Form:
@@ -209,25 +359,24 @@ class FormAPI:
     
     def fill(self, form_id: str, values: dict[str, str]) -> None:
         """Fill form fields."""
-        self._b._require_cap("form.fill", form_id)
+        cap = self._b._require_cap("form.fill", form_id, log_check=False)
         form = self.get(form_id)
         form.fill(values)
-        # Log without sensitive values
-        safe_keys = list(values.keys())
-        self._b._log("form.fill", form_id, {"fields": safe_keys}, "success")
+        # Log field names only, never values
+        self._b._log("form.fill", form_id, {"fields": tuple(values)}, "success", cap)
     
     def clear(self, form_id: str) -> None:
         """Clear form fields."""
-        self._b._require_cap("form.fill", form_id)
+        cap = self._b._require_cap("form.fill", form_id, log_check=False)
         form = self.get(form_id)
         form.clear()
-        self._b._log("form.clear", form_id, {}, "success")
+        self._b._log("form.clear", form_id, {}, "success", cap)
     
     def submit(self, form_id: str) -> dict:
         """Submit a form (IRREVERSIBLE - requires approval)."""
-        self._b._require_cap("form.submit", form_id)
+        cap = self._b._require_cap("form.submit", form_id, log_check=False)
         form = self.get(form_id)
-        self._b._log("form.submit", form_id, {}, "success")
+        self._b._log("form.submit", form_id, {}, "success", cap, sync=True)
         return {"submitted": True, "form_id": form_id}
 
 
@@ -239,9 +388,9 @@ class WorkspaceAPI:
     
     def create(self, name: str) -> Workspace:
         """Create a new workspace."""
-        self._b._require_cap("workspace.create", "*")
+        cap = self._b._require_cap("workspace.create", "*", log_check=False)
         ws = self._b._objects.create(ObjectType.WORKSPACE, name=name)
-        self._b._log("workspace.create", ws.id, {"name": name}, "success")
+        self._b._log("workspace.create", ws.id, {"name": name}, "success", cap)
         return ws
     
     def get(self, workspace_id: str) -> Workspace:
@@ -255,7 +404,7 @@ class WorkspaceAPI:
     def list(self) -> list[Workspace]:
         """List all workspaces."""
         self._b._require_cap("workspace.list", "*")
-        return [w for w in self._b._objects.list_by_type(ObjectType.WORKSPACE) if isinstance(w, Workspace)]
+        return self._b._objects.list_by_type(ObjectType.WORKSPACE)
 
 
 class HumanAPI:
@@ -263,17 +412,18 @@ class HumanAPI:
     
     def __init__(self, browser: BrowserAPI):
         self._b = browser
-        self._auto_approve = False  # For testing
+        # For testing; an Event so concurrent executions see flips atomically
+        self._auto_approve = threading.Event()
     
     def approve(self, message: str) -> bool:
         """Request human approval for a sensitive operation.
         
         In a real implementation, this would show a UI prompt.
-        For testing, returns self._auto_approve.
+        For testing, returns whether auto-approve is set.
         """
         self._b._log("human.approve", "user", {"message": message}, "requested")
         
-        if self._auto_approve:
+        if self._auto_approve.is_set():
             self._b._log("human.approve", "user", {}, "auto_approved")
             return True
         
@@ -284,7 +434,10 @@ class HumanAPI:
     
     def set_auto_approve(self, value: bool) -> None:
         """Set auto-approve mode (for testing only)."""
-        self._auto_approve = value
+        if value:
+            self._auto_approve.set()
+        else:
+            self._auto_approve.clear()
 
 
 class AuditAPI:
@@ -353,37 +506,90 @@ class AgentRuntime:
         self._audit = audit
         self._transactions = transactions
         self._timeout = timeout_seconds
+        self._code_cache: dict[bytes, CompiledCode] = {}
+        self._api_cache: weakref.WeakValueDictionary[str, BrowserAPI] = weakref.WeakValueDictionary()
+        self._recent_apis: deque[BrowserAPI] = deque(maxlen=RECENT_API_COUNT)
+        self._api_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=EXECUTION_WORKERS,
+            thread_name_prefix="agent-exec",
+        )
+        # One slot per worker, held until the script really returns (even
+        # after its caller timed out), so a submitted script never queues
+        self._slots = threading.BoundedSemaphore(EXECUTION_WORKERS)
     
-    def validate_code(self, code: str) -> list[str]:
-        """Validate code for blocked imports and syntax errors.
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the execution worker threads.
+        
+        Args:
+            wait: Block until running executions finish
+        """
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+    
+    def _compile(self, code: str) -> CompiledCode:
+        """Parse, validate and compile agent code, memoized by source digest.
         
         Returns:
-            List of validation errors (empty if valid)
+            (code object or None if invalid, validation errors)
         """
-        errors = []
+        key = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        cached = self._code_cache.get(key)
+        if cached is not None:
+            return cached
         
-        # Parse
         try:
-            tree = ast.parse(code)
+            # Parse once; the validated tree is what gets compiled. Both steps
+            # use dont_inherit so agent code doesn't pick up this module's
+            # __future__ imports (e.g. stringified annotations).
+            tree = compile(code, AGENT_FILENAME, "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+            violations = _find_blocked_imports(tree, code)
+            if violations:
+                compiled: CompiledCode = (None, tuple(violations))
+            else:
+                _strip_docstrings(tree)
+                compiled = (compile(tree, AGENT_FILENAME, "exec", dont_inherit=True), ())
         except SyntaxError as e:
-            return [f"Syntax error: {e}"]
+            compiled = (None, (f"Syntax error: {e}",))
         
-        # Check imports
-        validator = ImportValidator()
-        validator.visit(tree)
-        errors.extend(validator.violations)
+        if len(self._code_cache) >= CODE_CACHE_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order)
+            self._code_cache.pop(next(iter(self._code_cache), None), None)
+        self._code_cache[key] = compiled
+        return compiled
+    
+    def validate_code(self, code: str) -> list[str]:
+        """Validate code for blocked imports and syntax errors.
         
-        return errors
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        return list(self._compile(code)[1])
     
     def create_browser_api(self, principal: str) -> BrowserAPI:
-        """Create a BrowserAPI instance for a principal."""
-        return BrowserAPI(
-            principal=principal,
-            caps=self._caps,
-            objects=self._objects,
-            audit=self._audit,
-            transactions=self._transactions,
-        )
+        """Get the BrowserAPI instance for a principal.
+        
+        Instances are reused across executions: every check goes to the
+        broker, so the API itself holds no per-call state. execute() runs
+        each script against a _for_execution() view, so HumanAPI's
+        auto-approve setting starts off every time. The cache is weak, so principal
+        churn can't grow it without bound; an instance lives while an
+        execution uses it or it is among the RECENT_API_COUNT newest.
+        """
+        api = self._api_cache.get(principal)
+        if api is not None:
+            return api
+        with self._api_lock:
+            api = self._api_cache.get(principal)
+            if api is None:
+                api = self._api_cache[principal] = BrowserAPI(
+                    principal=principal,
+                    caps=self._caps,
+                    objects=self._objects,
+                    audit=self._audit,
+                    transactions=self._transactions,
+                )
+                self._recent_apis.append(api)
+        return api
     
     def execute(self, code: str, principal: str = "agent:default") -> ExecutionResult:
         """Execute agent code in a sandboxed environment.
@@ -395,8 +601,8 @@ class AgentRuntime:
         Returns:
             ExecutionResult with outcome and any errors
         """
-        # Validate first
-        errors = self.validate_code(code)
+        # Validate first (compiles once; repeated submissions hit the cache)
+        program, errors = self._compile(code)
         if errors:
             return ExecutionResult(
                 state=ExecutionState.FAILED,
@@ -404,58 +610,63 @@ class AgentRuntime:
                 error_type="ValidationError",
             )
         
+        if not self._slots.acquire(blocking=False):
+            return ExecutionResult(
+                state=ExecutionState.FAILED,
+                error=f"All {EXECUTION_WORKERS} execution workers are busy",
+                error_type="RuntimeSaturated",
+            )
+        
         # Create restricted globals
-        browser_api = self.create_browser_api(principal)
+        browser_api = self.create_browser_api(principal)._for_execution()
         restricted_globals = {
             "browser": browser_api,
-            "__builtins__": {
-                "print": print,
-                "len": len,
-                "range": range,
-                "enumerate": enumerate,
-                "zip": zip,
-                "map": map,
-                "filter": filter,
-                "list": list,
-                "dict": dict,
-                "set": set,
-                "tuple": tuple,
-                "str": str,
-                "int": int,
-                "float": float,
-                "bool": bool,
-                "True": True,
-                "False": False,
-                "None": None,
-                "isinstance": isinstance,
-                "hasattr": hasattr,
-                "getattr": getattr,
-            },
+            # A private copy: exec'd code can reach and mutate __builtins__
+            "__builtins__": _SAFE_BUILTINS.copy(),
         }
         
-        start_time = time.time()
-        result = {"value": None}
-        error = {"value": None, "type": None}
+        # Monotonic clock: durations can't go negative on wall-clock adjustments
+        start_ns = time.perf_counter_ns()
+        return_value = None
+        error = None
+        error_type = None
         
         def run_code():
+            nonlocal return_value, error, error_type
             try:
-                exec(code, restricted_globals)
-                result["value"] = restricted_globals.get("__result__")
+                exec(program, restricted_globals)
+                return_value = restricted_globals.get("__result__")
             except CapabilityDenied as e:
-                error["value"] = str(e)
-                error["type"] = "CapabilityDenied"
+                error = str(e)
+                error_type = "CapabilityDenied"
             except Exception as e:
-                error["value"] = f"{type(e).__name__}: {e}"
-                error["type"] = type(e).__name__
+                error_type = type(e).__name__
+                error = f"{error_type}: {e}"
+            finally:
+                self._slots.release()
         
-        # Run with timeout
-        thread = threading.Thread(target=run_code)
-        thread.start()
-        thread.join(timeout=self._timeout)
+        # Run with timeout on a reused worker thread
+        try:
+            future = self._pool.submit(run_code)
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            future.result(timeout=self._timeout)
+            timed_out = False
+        except FuturesTimeout:
+            # Never start late if still queued; a running script can't be
+            # interrupted and keeps its worker (and slot) until it returns
+            if future.cancel():
+                self._slots.release()
+            timed_out = True
         
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
         
-        if thread.is_alive():
+        # Make the script's buffered audit entries durable before returning
+        self._audit.flush()
+        
+        if timed_out:
             return ExecutionResult(
                 state=ExecutionState.TIMEOUT,
                 error=f"Execution timed out after {self._timeout}s",
@@ -463,70 +674,186 @@ class AgentRuntime:
                 duration_ms=duration_ms,
             )
         
-        if error["value"]:
+        if error_type is not None:
             return ExecutionResult(
                 state=ExecutionState.FAILED,
-                error=error["value"],
-                error_type=error["type"],
+                error=error,
+                error_type=error_type,
                 duration_ms=duration_ms,
             )
         
         return ExecutionResult(
             state=ExecutionState.COMPLETED,
-            return_value=result["value"],
+            return_value=return_value,
             duration_ms=duration_ms,
         )
 
 
 # --- IPC Server (Unix Socket + JSON) ---
 
+# Each IPC message is a 4-byte big-endian length followed by that many bytes
+# of UTF-8 JSON.
+_FRAME_HEADER = struct.Struct(">I")
+
+# Listen backlog and connection-handler threads for IPCServer
+IPC_BACKLOG = 64
+IPC_WORKERS = 8
+
+# One shared compact encoder for IPC payloads; UTF-8 passes through unescaped
+# since the frame is encoded as UTF-8 anyway.
+_encode_message = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# Upper bound on a single message, so a bad header can't force a huge allocation
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    """Read exactly size bytes from a socket."""
+    buf = bytearray(size)
+    view = memoryview(buf)
+    pos = 0
+    while pos < size:
+        n = sock.recv_into(view[pos:])
+        if n == 0:
+            raise ConnectionError("Connection closed mid-message")
+        pos += n
+    return buf
+
+
+def _send_message(sock: socket.socket, message: Any) -> None:
+    """Send one length-prefixed JSON message."""
+    payload = _encode_message(message).encode("utf-8")
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_message(sock: socket.socket) -> Any:
+    """Receive one length-prefixed JSON message."""
+    (size,) = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"IPC message too large: {size} bytes")
+    # json.loads takes the raw bytes directly; no separate decode pass
+    return json.loads(_recv_exact(sock, size))
+
 class IPCServer:
-    """Simple IPC server using Unix sockets and JSON messages."""
+    """Simple IPC server using Unix sockets and length-prefixed JSON messages.
+    
+    On Linux, a socket_path starting with a NUL byte names an abstract
+    socket: it lives in the kernel namespace and disappears when closed,
+    so no socket file is created, checked or unlinked.
+    """
     
     def __init__(self, socket_path: str, runtime: AgentRuntime):
         self._socket_path = socket_path
+        self._abstract = sys.platform == "linux" and socket_path.startswith("\0")
         self._runtime = runtime
         self._server: Optional[socket.socket] = None
         self._running = False
+        self._wake_w: Optional[int] = None
+        # Connections handed back by workers, waiting to be re-registered
+        self._idle: queue.SimpleQueue[socket.socket] = queue.SimpleQueue()
+        # Guards _wake_w so nothing writes to the pipe after it is closed
+        self._wake_lock = threading.Lock()
     
     def start(self) -> None:
-        """Start the IPC server."""
-        # Remove existing socket
-        path = Path(self._socket_path)
-        if path.exists():
-            path.unlink()
+        """Start the IPC server.
+        
+        Blocks in a selector loop until stop() is called. Connections are
+        persistent: the loop waits for a request on any of them, a worker
+        from the pool serves it, then hands the connection back to the
+        loop, so idle clients don't pin worker threads. The loop sleeps in
+        the kernel until a client connects or sends, a worker returns a
+        connection, or stop() writes to the wake pipe.
+        """
+        # Remove a stale socket file (abstract sockets have none)
+        if not self._abstract:
+            Path(self._socket_path).unlink(missing_ok=True)
         
         self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self._server.bind(self._socket_path)
-        self._server.listen(5)
+        self._server.listen(IPC_BACKLOG)
+        self._server.setblocking(False)
+        
+        # Set before the wake pipe exists: a stop() that races in between
+        # clears it and the loop below never starts
         self._running = True
+        wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
+        selector = selectors.DefaultSelector()
+        selector.register(self._server, selectors.EVENT_READ)
+        selector.register(wake_r, selectors.EVENT_READ)
+        handlers = ThreadPoolExecutor(max_workers=IPC_WORKERS, thread_name_prefix="ipc-conn")
         
-        while self._running:
-            try:
-                self._server.settimeout(1.0)
-                conn, _ = self._server.accept()
-                self._handle_connection(conn)
-            except socket.timeout:
-                continue
-            except Exception:
-                if self._running:
-                    raise
+        try:
+            while self._running:
+                for key, _ in selector.select():
+                    sock = key.fileobj
+                    if sock is self._server:
+                        try:
+                            conn, _ = self._server.accept()
+                        except BlockingIOError:
+                            continue
+                        # Workers read in blocking mode, but a new connection
+                        # waits in the selector like an idle one: a client
+                        # that connects and stays silent must not hold a worker
+                        conn.setblocking(True)
+                        selector.register(conn, selectors.EVENT_READ)
+                    elif sock == wake_r:
+                        os.read(wake_r, 4096)
+                        while True:
+                            try:
+                                conn = self._idle.get_nowait()
+                            except queue.Empty:
+                                break
+                            selector.register(conn, selectors.EVENT_READ)
+                    else:
+                        # A request is waiting; serve it off the loop thread
+                        selector.unregister(sock)
+                        handlers.submit(self._handle_connection, sock)
+        finally:
+            with self._wake_lock:
+                wake_w, self._wake_w = self._wake_w, None
+            for key in list(selector.get_map().values()):
+                if key.fileobj is not self._server and key.fileobj != wake_r:
+                    key.fileobj.close()
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            selector.close()
+            # Let in-flight requests finish, so every connection is closed
+            # by the time start() returns (bounded by the runtime timeout)
+            handlers.shutdown(wait=True)
+            self._server.close()
+            os.close(wake_r)
+            os.close(wake_w)
     
     def stop(self) -> None:
         """Stop the IPC server."""
         self._running = False
-        if self._server:
-            self._server.close()
-        path = Path(self._socket_path)
-        if path.exists():
-            path.unlink()
+        self._wake()
+        if not self._abstract:
+            Path(self._socket_path).unlink(missing_ok=True)
+    
+    def _wake(self) -> None:
+        """Interrupt the selector loop's wait."""
+        with self._wake_lock:
+            if self._wake_w is not None:
+                try:
+                    os.write(self._wake_w, b"x")
+                except BlockingIOError:
+                    pass  # Pipe full: a wakeup is already pending
     
     def _handle_connection(self, conn: socket.socket) -> None:
-        """Handle an incoming connection."""
+        """Serve one request, then return the connection to the loop."""
+        try:
+            request = _recv_message(conn)
+        except (OSError, ValueError):
+            # Client disconnected (ConnectionError) or sent a bad frame
+            conn.close()
+            return
+        
         try:
-            data = conn.recv(65536).decode("utf-8")
-            request = json.loads(data)
-            
             method = request.get("method")
             params = request.get("params", {})
             
@@ -547,20 +874,39 @@ class IPCServer:
             else:
                 response = {"error": f"Unknown method: {method}"}
             
-            conn.send(json.dumps(response).encode("utf-8"))
-        finally:
+            _send_message(conn, response)
+        except BaseException:
             conn.close()
+            raise
+        
+        with self._wake_lock:
+            if self._wake_w is None:
+                conn.close()  # Server stopped while this request ran
+                return
+            self._idle.put(conn)
+        self._wake()
 
 
 class IPCClient:
-    """Client for communicating with the kernel via IPC."""
+    """Client for communicating with the kernel via IPC.
+    
+    Holds one persistent connection, opened on first use and shared by
+    all calls (requests are serialized on it). Call close() when done.
+    """
     
     def __init__(self, socket_path: str):
         self._socket_path = socket_path
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
     
     def call(self, method: str, **params) -> dict:
         """Make an IPC call to the kernel.
         
+        If a previously used connection turns out to be dead (e.g. the
+        server restarted) while the request is being sent, reconnects and
+        sends it once more. A failure after the request was written is
+        never retried, since the server may already have run it.
+        
         Args:
             method: Method name ('execute', 'validate')
             **params: Method parameters
@@ -568,15 +914,54 @@ class IPCClient:
         Returns:
             Response dictionary
         """
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        message = {"method": method, "params": params}
+        with self._lock:
+            reused = self._sock is not None
+            try:
+                self._send(message)
+            except ConnectionError:
+                if not reused:
+                    raise
+                # The stale connection refused the frame, so the server
+                # never saw a complete request; resending is safe
+                self._send(message)
+            return self._receive()
+    
+    def _send(self, message: dict) -> None:
+        """Send one request, connecting first if needed; caller holds the lock."""
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self._socket_path)
+            except BaseException:
+                sock.close()
+                raise
+            self._sock = sock
         try:
-            sock.connect(self._socket_path)
-            request = {"method": method, "params": params}
-            sock.send(json.dumps(request).encode("utf-8"))
-            response = sock.recv(65536).decode("utf-8")
-            return json.loads(response)
-        finally:
-            sock.close()
+            _send_message(self._sock, message)
+        except BaseException:
+            self._discard()
+            raise
+    
+    def _receive(self) -> dict:
+        """Read one response; caller holds the lock."""
+        try:
+            return _recv_message(self._sock)
+        except BaseException:
+            self._discard()
+            raise
+    
+    def _discard(self) -> None:
+        """Drop a connection that may be mid-frame; never reuse it."""
+        self._sock.close()
+        self._sock = None
+    
+    def close(self) -> None:
+        """Close the connection; the next call reconnects."""
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
     
     def execute(self, code: str, principal: str = "agent:default") -> dict:
         """Execute code via IPC."""
@@ -14,17 +14,176 @@ Answers the critical questions:
 
 from __future__ import annotations
 
+import atexit
+import copy
+import itertools
 import json
 import sqlite3
 import threading
 import time
-import uuid
-from dataclasses import dataclass, field, asdict
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Callable
 
 
+# Connection tuning applied once at connect time. WAL + NORMAL sync means a
+# grant/revoke commit appends to the write-ahead log instead of rewriting a
+# rollback journal behind a full fsync.
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# One shared compact encoder for metadata columns
+_encode_metadata = json.JSONEncoder(separators=(",", ":")).encode
+_EMPTY_METADATA = "{}"
+
+
+def _dump_metadata(metadata: dict) -> str:
+    """Serialize a metadata dict; the common empty case skips the encoder."""
+    return _encode_metadata(metadata) if metadata else _EMPTY_METADATA
+
+
+def _load_metadata(raw: str) -> dict:
+    """Deserialize a metadata column written by _dump_metadata (or json.dumps)."""
+    return {} if raw == _EMPTY_METADATA else json.loads(raw)
+
+
+def _copy_metadata(metadata: dict) -> dict:
+    """Deep-copy metadata for to_dict (as asdict did); empty dicts skip deepcopy."""
+    return copy.deepcopy(metadata) if metadata else {}
+
+
+# Record ids are a process-wide counter seeded with the start time in
+# milliseconds shifted left 20 bits, rendered as fixed-width hex. Ids are
+# unique across every manager in the process. They sort by creation order,
+# so primary-key inserts append at the right edge of the B-tree. A later
+# process starts from a later millisecond, so it can only reuse an id if
+# the previous one issued over a million ids per millisecond it ran.
+_id_counter = itertools.count(time.time_ns() // 1_000_000 << 20)
+
+
+def _new_id(prefix: str) -> str:
+    """Return the next record id, e.g. 'grant:018f3a2b1c400001'."""
+    return f"{prefix}:{next(_id_counter):016x}"
+
+
+# Memoized list_grants results; the cache is cleared whenever a grant is
+# recorded or revoked, and when it grows past this many filter combinations.
+LIST_CACHE_MAX_ENTRIES = 256
+
+# With background_writes, session/grant upserts are buffered and written by a
+# writer thread this long after the first one arrives (batching the burst).
+WRITE_BATCH_DELAY_SECONDS = 0.005
+# How often an idle writer thread checks whether its manager is still alive
+WRITER_IDLE_CHECK_SECONDS = 1.0
+
+# Rows fetched per round-trip when loading persisted state at startup.
+LOAD_BATCH_SIZE = 1000
+
+# Bumped whenever _SCHEMA_SQL changes; stored in PRAGMA user_version so
+# opening an up-to-date database skips the schema script entirely.
+SCHEMA_VERSION = 1
+
+# Runs as one transaction (executescript can't join _transaction, since it
+# commits any open transaction first). Every statement is idempotent, so it
+# also upgrades databases written before user_version was tracked.
+_SCHEMA_SQL = f"""
+    BEGIN IMMEDIATE;
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        principal TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL,
+        workspace_id TEXT,
+        metadata TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS grants (
+        id TEXT PRIMARY KEY,
+        token TEXT NOT NULL,
+        principal TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        resource TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        session_id TEXT,
+        granted_at REAL NOT NULL,
+        granted_by TEXT NOT NULL,
+        expires_at REAL,
+        revoked_at REAL,
+        revoked_by TEXT,
+        metadata TEXT NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS revocations (
+        id TEXT PRIMARY KEY,
+        grant_id TEXT NOT NULL,
+        token TEXT NOT NULL,
+        principal TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        resource TEXT NOT NULL,
+        revoked_at REAL NOT NULL,
+        revoked_by TEXT NOT NULL,
+        reason TEXT
+    ) WITHOUT ROWID;
+    -- Superseded by idx_grants_active, a partial index holding only
+    -- unrevoked grants (revoking a grant drops it from the index)
+    DROP INDEX IF EXISTS idx_grants_principal;
+    DROP INDEX IF EXISTS idx_grants_principal_time;
+    CREATE INDEX IF NOT EXISTS idx_grants_active
+        ON grants(principal, granted_at DESC) WHERE revoked_at IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_grants_token ON grants(token);
+    CREATE INDEX IF NOT EXISTS idx_revocations_token ON revocations(token);
+    CREATE INDEX IF NOT EXISTS idx_revocations_principal_time
+        ON revocations(principal, revoked_at DESC);
+    PRAGMA user_version = {SCHEMA_VERSION};
+    COMMIT;
+"""
+
+_LOAD_SESSIONS_SQL = """
+    SELECT id, type, principal, created_at, expires_at, workspace_id, metadata
+    FROM sessions WHERE type = ?
+"""
+# WITHOUT ROWID tables scan in id order; sort so indexes keep grant order
+_LOAD_GRANTS_SQL = """
+    SELECT id, token, principal, operation, resource, scope, session_id,
+           granted_at, granted_by, expires_at, revoked_at, revoked_by, metadata
+    FROM grants ORDER BY granted_at
+"""
+_LOAD_REVOCATIONS_SQL = """
+    SELECT id, grant_id, token, principal, operation, resource,
+           revoked_at, revoked_by, reason
+    FROM revocations ORDER BY revoked_at
+"""
+
+# Write statements. Each is a single module-level string so the sqlite3
+# connection's statement cache prepares it once and reuses it on every call.
+_UPSERT_SESSION_SQL = """
+    INSERT OR REPLACE INTO sessions
+    (id, type, principal, created_at, expires_at, workspace_id, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_DELETE_SESSION_SQL = "DELETE FROM sessions WHERE id = ?"
+_UPSERT_GRANT_SQL = """
+    INSERT OR REPLACE INTO grants
+    (id, token, principal, operation, resource, scope, session_id,
+     granted_at, granted_by, expires_at, revoked_at, revoked_by, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_REVOKE_GRANT_SQL = "UPDATE grants SET revoked_at = ?, revoked_by = ? WHERE id = ?"
+_INSERT_REVOCATION_SQL = """
+    INSERT INTO revocations
+    (id, grant_id, token, principal, operation, resource,
+     revoked_at, revoked_by, reason)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 class SessionType(Enum):
     """Types of capability sessions."""
     PROCESS = "process"      # Lives until kernel process exits
@@ -41,7 +200,13 @@ class GrantScope(Enum):
     ALWAYS = "always"        # Permanent (persisted)
 
 
-@dataclass
+# Value -> member lookups for loaded rows and from_dict, skipping Enum.__call__
+# (from_dict falls back to it so unknown values still raise ValueError)
+_SESSION_TYPES = {t.value: t for t in SessionType}
+_GRANT_SCOPES = {s.value: s for s in GrantScope}
+
+
+@dataclass(slots=True)
 class Session:
     """A capability session."""
     id: str
@@ -52,24 +217,36 @@ class Session:
     workspace_id: Optional[str] = None
     metadata: dict = field(default_factory=dict)
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Whether the session has expired; pass now to reuse one clock read."""
         if self.expires_at is None:
             return False
-        return time.time() > self.expires_at
+        return (time.time() if now is None else now) > self.expires_at
     
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["type"] = self.type.value
-        return d
+        return {
+            "id": self.id,
+            "type": self.type.value,
+            "principal": self.principal,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "workspace_id": self.workspace_id,
+            "metadata": _copy_metadata(self.metadata),
+        }
     
     @classmethod
     def from_dict(cls, d: dict) -> "Session":
         d = dict(d)
-        d["type"] = SessionType(d["type"])
+        d["type"] = _SESSION_TYPES.get(d["type"]) or SessionType(d["type"])
         return cls(**d)
+    
+    @classmethod
+    def _from_row(cls, row: tuple) -> "Session":
+        """Build from a _LOAD_SESSIONS_SQL row (columns in field order)."""
+        return cls(row[0], _SESSION_TYPES[row[1]], *row[2:6], _load_metadata(row[6]))
 
 
-@dataclass
+@dataclass(slots=True)
 class CapabilityGrant:
     """A recorded capability grant with lifecycle tracking."""
     id: str
@@ -86,26 +263,44 @@ class CapabilityGrant:
     revoked_by: Optional[str] = None
     metadata: dict = field(default_factory=dict)
     
-    def is_active(self) -> bool:
+    def is_active(self, now: Optional[float] = None) -> bool:
+        """Whether the grant is unrevoked and unexpired; pass now to reuse one clock read."""
         if self.revoked_at is not None:
             return False
-        if self.expires_at is not None and time.time() > self.expires_at:
-            return False
-        return True
+        if self.expires_at is None:
+            return True
+        return (time.time() if now is None else now) <= self.expires_at
     
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["scope"] = self.scope.value
-        return d
+        return {
+            "id": self.id,
+            "token": self.token,
+            "principal": self.principal,
+            "operation": self.operation,
+            "resource": self.resource,
+            "scope": self.scope.value,
+            "session_id": self.session_id,
+            "granted_at": self.granted_at,
+            "granted_by": self.granted_by,
+            "expires_at": self.expires_at,
+            "revoked_at": self.revoked_at,
+            "revoked_by": self.revoked_by,
+            "metadata": _copy_metadata(self.metadata),
+        }
     
     @classmethod
     def from_dict(cls, d: dict) -> "CapabilityGrant":
         d = dict(d)
-        d["scope"] = GrantScope(d["scope"])
+        d["scope"] = _GRANT_SCOPES.get(d["scope"]) or GrantScope(d["scope"])
         return cls(**d)
+    
+    @classmethod
+    def _from_row(cls, row: tuple) -> "CapabilityGrant":
+        """Build from a _LOAD_GRANTS_SQL row (columns in field order)."""
+        return cls(*row[:5], _GRANT_SCOPES[row[5]], *row[6:12], _load_metadata(row[12]))
 
 
-@dataclass
+@dataclass(slots=True)
 class RevocationRecord:
     """A record of a revoked capability (persisted to prevent resurrection)."""
     id: str
@@ -119,11 +314,58 @@ class RevocationRecord:
     reason: str = ""
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "grant_id": self.grant_id,
+            "token": self.token,
+            "principal": self.principal,
+            "operation": self.operation,
+            "resource": self.resource,
+            "revoked_at": self.revoked_at,
+            "revoked_by": self.revoked_by,
+            "reason": self.reason,
+        }
     
     @classmethod
     def from_dict(cls, d: dict) -> "RevocationRecord":
         return cls(**d)
+    
+    @classmethod
+    def _from_row(cls, row: tuple) -> "RevocationRecord":
+        """Build from a _LOAD_REVOCATIONS_SQL row (columns in field order)."""
+        return cls(*row[:8], row[8] or "")
+
+
+def _background_writer(manager_ref: weakref.ref, wake: threading.Event) -> None:
+    """Flush a SessionManager's buffered writes shortly after each first write.
+    
+    Holds only a weak reference so an idle writer never keeps its manager
+    alive; exits once the manager is closed or gone.
+    """
+    while True:
+        if wake.wait(WRITER_IDLE_CHECK_SECONDS):
+            time.sleep(WRITE_BATCH_DELAY_SECONDS)
+            wake.clear()
+        manager = manager_ref()
+        if manager is None or manager.closed:
+            return
+        manager.flush()
+        del manager
+
+
+# Managers with buffered writes not yet closed. One atexit hook closes
+# whatever is left; close() removes a manager, so the set never grows with
+# managers that were opened and closed.
+_open_managers: weakref.WeakSet[SessionManager] = weakref.WeakSet()
+
+
+def _close_open_managers() -> None:
+    """atexit hook: close every manager with buffered writes still open."""
+    for manager in list(_open_managers):
+        manager.close()
+
+
+atexit.register(_close_open_managers)
 
 
 class SessionManager:
@@ -136,134 +378,170 @@ class SessionManager:
     4. Users can query and revoke grants by various criteria
     """
     
-    def __init__(self, db_path: Optional[str | Path] = None):
+    def __init__(self, db_path: Optional[str | Path] = None, background_writes: bool = False):
         """Initialize session manager.
         
         Args:
             db_path: Path to SQLite database for persistence.
                     If None, uses in-memory (no persistence).
+            background_writes: If True, persistent session and grant writes
+                    are buffered and committed in batches by a writer thread
+                    (call flush() or close() to force them out). Revocations
+                    are always written synchronously, after any buffered
+                    writes, so a revoked grant can't resurrect on restart.
         """
         self._db_path = str(db_path) if db_path else ":memory:"
-        self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        self._lock = threading.Lock()
+        # Autocommit mode: single statements commit on their own and
+        # multi-statement writes use explicit BEGIN IMMEDIATE (_transaction)
+        self._conn = sqlite3.connect(self._db_path, check_same_thread=False, isolation_level=None)
+        if self._db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in _SQLITE_PRAGMAS:
+            self._conn.execute(pragma)
+        self._lock = threading.RLock()
         
         self._sessions: dict[str, Session] = {}
         self._grants: dict[str, CapabilityGrant] = {}
         self._revocations: dict[str, RevocationRecord] = {}
+        # Token indexes; every persisted row is loaded at startup, so these
+        # are authoritative and lookups never need to go to SQLite. Revoked
+        # tokens only need membership tests, so they're a bare set.
+        self._grants_by_token: dict[str, CapabilityGrant] = {}
+        self._revoked_tokens: set[str] = set()
+        # Secondary grant indexes (id -> grant; dicts keep grant order).
+        # _active_grants holds unrevoked grants; expiry is still checked.
+        self._grants_by_principal: dict[str, dict[str, CapabilityGrant]] = {}
+        self._grants_by_session: dict[str, dict[str, CapabilityGrant]] = {}
+        self._active_grants: dict[str, CapabilityGrant] = {}
+        # (principal, active_only, since) -> (sorted grants, valid_until)
+        self._list_cache: dict[tuple, tuple[list[CapabilityGrant], float]] = {}
+        
+        self._background_writes = background_writes
+        self._pending: list[tuple[str, tuple]] = []  # buffered (sql, params)
+        self._write_requested = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
         
         self._init_db()
         self._load_persisted_data()
+        if background_writes and self._db_path != ":memory:":
+            # Buffered writes must reach disk even if the owner never closes
+            _open_managers.add(self)
     
     def _init_db(self) -> None:
-        """Initialize database schema."""
+        """Create or migrate the schema unless it is already current."""
         with self._lock:
-            self._conn.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id TEXT PRIMARY KEY,
-                    type TEXT NOT NULL,
-                    principal TEXT NOT NULL,
-                    created_at REAL NOT NULL,
-                    expires_at REAL,
-                    workspace_id TEXT,
-                    metadata TEXT NOT NULL
-                )
-            """)
-            self._conn.execute("""
-                CREATE TABLE IF NOT EXISTS grants (
-                    id TEXT PRIMARY KEY,
-                    token TEXT NOT NULL,
-                    principal TEXT NOT NULL,
-                    operation TEXT NOT NULL,
-                    resource TEXT NOT NULL,
-                    scope TEXT NOT NULL,
-                    session_id TEXT,
-                    granted_at REAL NOT NULL,
-                    granted_by TEXT NOT NULL,
-                    expires_at REAL,
-                    revoked_at REAL,
-                    revoked_by TEXT,
-                    metadata TEXT NOT NULL
-                )
-            """)
-            self._conn.execute("""
-                CREATE TABLE IF NOT EXISTS revocations (
-                    id TEXT PRIMARY KEY,
-                    grant_id TEXT NOT NULL,
-                    token TEXT NOT NULL,
-                    principal TEXT NOT NULL,
-                    operation TEXT NOT NULL,
-                    resource TEXT NOT NULL,
-                    revoked_at REAL NOT NULL,
-                    revoked_by TEXT NOT NULL,
-                    reason TEXT
-                )
-            """)
-            self._conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_grants_principal ON grants(principal)
-            """)
-            self._conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_grants_token ON grants(token)
-            """)
-            self._conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_revocations_token ON revocations(token)
-            """)
-            self._conn.commit()
+            (version,) = self._conn.execute(
+                "SELECT user_version FROM pragma_user_version"
+            ).fetchone()
+            if version == SCHEMA_VERSION:
+                return
+            try:
+                self._conn.executescript(_SCHEMA_SQL)
+            except BaseException:
+                # executescript stops at the failing statement, leaving the
+                # script's own BEGIN open
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+    
+    @contextmanager
+    def _transaction(self):
+        """Hold the lock and run the block as one BEGIN IMMEDIATE ... COMMIT.
+        
+        Nested use joins the enclosing transaction. Single-statement writes
+        don't need this; they commit on their own in autocommit mode.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _write(self, sql: str, params: tuple) -> None:
+        """Run a single-row write now, or buffer it for the background writer."""
+        with self._lock:
+            if not self._background_writes:
+                self._conn.execute(sql, params)
+                return
+            self._pending.append((sql, params))
+            first = len(self._pending) == 1
+        if first:
+            self._start_writer()
+            self._write_requested.set()
+    
+    def _write_pending(self) -> None:
+        """Execute buffered writes in order; caller holds an open transaction."""
+        pending, self._pending = self._pending, []
+        for sql, group in itertools.groupby(pending, key=lambda item: item[0]):
+            self._conn.executemany(sql, [params for _, params in group])
+    
+    def _start_writer(self) -> None:
+        """Start the background writer used by background_writes, once."""
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(
+                target=_background_writer,
+                args=(weakref.ref(self), self._write_requested),
+                name="session-writer",
+                daemon=True,
+            )
+        self._writer.start()
+    
+    def flush(self) -> None:
+        """Commit all buffered writes in one transaction."""
+        with self._lock:
+            if self._pending and not self._closed:
+                with self._transaction():
+                    self._write_pending()
+    
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+    
+    def close(self) -> None:
+        """Flush buffered writes and close the database. Idempotent."""
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+            self._conn.close()
+        _open_managers.discard(self)
+        self._write_requested.set()  # let the background writer exit
     
     def _load_persisted_data(self) -> None:
-        """Load persisted sessions, grants, and revocations from disk."""
+        """Load persisted sessions, grants, and revocations from disk.
+        
+        Rows are fetched LOAD_BATCH_SIZE at a time as plain tuples and built
+        positionally by each record's _from_row (each SELECT lists its columns
+        in dataclass field order).
+        """
         with self._lock:
             # Load sessions (only persistent ones matter after restart)
-            cursor = self._conn.execute(
-                "SELECT * FROM sessions WHERE type = ?",
-                (SessionType.PERSISTENT.value,)
-            )
-            for row in cursor:
-                session = Session(
-                    id=row[0],
-                    type=SessionType(row[1]),
-                    principal=row[2],
-                    created_at=row[3],
-                    expires_at=row[4],
-                    workspace_id=row[5],
-                    metadata=json.loads(row[6]),
-                )
-                self._sessions[session.id] = session
+            cursor = self._conn.execute(_LOAD_SESSIONS_SQL, (SessionType.PERSISTENT.value,))
+            while rows := cursor.fetchmany(LOAD_BATCH_SIZE):
+                self._sessions.update((row[0], Session._from_row(row)) for row in rows)
             
             # Load grants (all, including revoked for audit)
-            cursor = self._conn.execute("SELECT * FROM grants")
-            for row in cursor:
-                grant = CapabilityGrant(
-                    id=row[0],
-                    token=row[1],
-                    principal=row[2],
-                    operation=row[3],
-                    resource=row[4],
-                    scope=GrantScope(row[5]),
-                    session_id=row[6],
-                    granted_at=row[7],
-                    granted_by=row[8],
-                    expires_at=row[9],
-                    revoked_at=row[10],
-                    revoked_by=row[11],
-                    metadata=json.loads(row[12]),
-                )
-                self._grants[grant.id] = grant
+            cursor = self._conn.execute(_LOAD_GRANTS_SQL)
+            while rows := cursor.fetchmany(LOAD_BATCH_SIZE):
+                for row in rows:
+                    self._index_grant(CapabilityGrant._from_row(row))
             
             # Load revocations
-            cursor = self._conn.execute("SELECT * FROM revocations")
-            for row in cursor:
-                revocation = RevocationRecord(
-                    id=row[0],
-                    grant_id=row[1],
-                    token=row[2],
-                    principal=row[3],
-                    operation=row[4],
-                    resource=row[5],
-                    revoked_at=row[6],
-                    revoked_by=row[7],
-                    reason=row[8] or "",
-                )
-                self._revocations[revocation.id] = revocation
+            cursor = self._conn.execute(_LOAD_REVOCATIONS_SQL)
+            while rows := cursor.fetchmany(LOAD_BATCH_SIZE):
+                for row in rows:
+                    self._index_revocation(RevocationRecord._from_row(row))
     
     # =========================================================================
     # Session Management
@@ -289,7 +567,7 @@ class SessionManager:
         Returns:
             The created Session
         """
-        session_id = f"session:{uuid.uuid4().hex[:8]}"
+        session_id = _new_id("session")
         expires_at = time.time() + ttl_seconds if ttl_seconds else None
         
         session = Session(
@@ -312,24 +590,18 @@ class SessionManager:
     
     def _persist_session(self, session: Session) -> None:
         """Persist a session to disk."""
-        with self._lock:
-            self._conn.execute(
-                """
-                INSERT OR REPLACE INTO sessions 
-                (id, type, principal, created_at, expires_at, workspace_id, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    session.id,
-                    session.type.value,
-                    session.principal,
-                    session.created_at,
-                    session.expires_at,
-                    session.workspace_id,
-                    json.dumps(session.metadata),
-                ),
-            )
-            self._conn.commit()
+        self._write(
+            _UPSERT_SESSION_SQL,
+            (
+                session.id,
+                session.type.value,
+                session.principal,
+                session.created_at,
+                session.expires_at,
+                session.workspace_id,
+                _dump_metadata(session.metadata),
+            ),
+        )
     
     def end_session(self, session_id: str) -> bool:
         """End a session and revoke all its grants.
@@ -342,14 +614,13 @@ class SessionManager:
             return False
         
         # Revoke all grants for this session
-        for grant in list(self._grants.values()):
-            if grant.session_id == session_id and grant.is_active():
-                self.revoke_grant(grant.id, revoked_by="session_end")
+        grants = self._grants_by_session.get(session_id, {})
+        self._revoke_grants(list(grants.values()), revoked_by="session_end")
         
-        # Remove from DB if persisted
-        with self._lock:
-            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-            self._conn.commit()
+        # Remove from DB if persisted (after any buffered insert of it)
+        with self._transaction():
+            self._write_pending()
+            self._conn.execute(_DELETE_SESSION_SQL, (session_id,))
         
         return True
     
@@ -393,7 +664,7 @@ class SessionManager:
         Returns:
             The recorded CapabilityGrant
         """
-        grant_id = f"grant:{uuid.uuid4().hex[:8]}"
+        grant_id = _new_id("grant")
         
         grant = CapabilityGrant(
             id=grant_id,
@@ -409,7 +680,7 @@ class SessionManager:
             metadata=metadata or {},
         )
         
-        self._grants[grant_id] = grant
+        self._index_grant(grant)
         
         # Persist if always scope
         if scope == GrantScope.ALWAYS:
@@ -417,33 +688,37 @@ class SessionManager:
         
         return grant
     
+    def _index_grant(self, grant: CapabilityGrant) -> None:
+        """Add a grant to the in-memory tables."""
+        self._grants[grant.id] = grant
+        self._grants_by_token.setdefault(grant.token, grant)
+        self._grants_by_principal.setdefault(grant.principal, {})[grant.id] = grant
+        if grant.session_id is not None:
+            self._grants_by_session.setdefault(grant.session_id, {})[grant.id] = grant
+        if grant.revoked_at is None:
+            self._active_grants[grant.id] = grant
+        self._list_cache.clear()
+    
     def _persist_grant(self, grant: CapabilityGrant) -> None:
         """Persist a grant to disk."""
-        with self._lock:
-            self._conn.execute(
-                """
-                INSERT OR REPLACE INTO grants 
-                (id, token, principal, operation, resource, scope, session_id,
-                 granted_at, granted_by, expires_at, revoked_at, revoked_by, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    grant.id,
-                    grant.token,
-                    grant.principal,
-                    grant.operation,
-                    grant.resource,
-                    grant.scope.value,
-                    grant.session_id,
-                    grant.granted_at,
-                    grant.granted_by,
-                    grant.expires_at,
-                    grant.revoked_at,
-                    grant.revoked_by,
-                    json.dumps(grant.metadata),
-                ),
-            )
-            self._conn.commit()
+        self._write(
+            _UPSERT_GRANT_SQL,
+            (
+                grant.id,
+                grant.token,
+                grant.principal,
+                grant.operation,
+                grant.resource,
+                grant.scope.value,
+                grant.session_id,
+                grant.granted_at,
+                grant.granted_by,
+                grant.expires_at,
+                grant.revoked_at,
+                grant.revoked_by,
+                _dump_metadata(grant.metadata),
+            ),
+        )
     
     def revoke_grant(
         self,
@@ -462,67 +737,84 @@ class SessionManager:
             True if grant was found and revoked
         """
         grant = self._grants.get(grant_id)
-        if not grant or not grant.is_active():
+        if not grant:
             return False
+        return self._revoke_grants([grant], revoked_by, reason) == 1
+    
+    def _revoke_grants(
+        self,
+        grants: list[CapabilityGrant],
+        revoked_by: str,
+        reason: str = "",
+    ) -> int:
+        """Revoke every still-active grant in one pass and one transaction.
         
-        grant.revoked_at = time.time()
-        grant.revoked_by = revoked_by
-        
-        # Create revocation record (always persisted)
-        revocation = RevocationRecord(
-            id=f"revoke:{uuid.uuid4().hex[:8]}",
-            grant_id=grant_id,
-            token=grant.token,
-            principal=grant.principal,
-            operation=grant.operation,
-            resource=grant.resource,
-            revoked_at=grant.revoked_at,
-            revoked_by=revoked_by,
-            reason=reason,
-        )
-        
-        self._revocations[revocation.id] = revocation
-        self._persist_revocation(revocation)
+        Revocation rows are inserted, and persisted (ALWAYS) grants updated,
+        with executemany inside a single commit.
         
-        # Update grant in DB if persisted
-        if grant.scope == GrantScope.ALWAYS:
-            self._persist_grant(grant)
+        Returns:
+            Number of grants revoked
+        """
+        now = time.time()
+        revocation_rows = []
+        grant_rows = []
+        for grant in grants:
+            if not grant.is_active(now):
+                continue
+            grant.revoked_at = now
+            grant.revoked_by = revoked_by
+            self._active_grants.pop(grant.id, None)
+            
+            # Create revocation record (always persisted)
+            revocation = RevocationRecord(
+                id=_new_id("revoke"),
+                grant_id=grant.id,
+                token=grant.token,
+                principal=grant.principal,
+                operation=grant.operation,
+                resource=grant.resource,
+                revoked_at=now,
+                revoked_by=revoked_by,
+                reason=reason,
+            )
+            self._index_revocation(revocation)
+            revocation_rows.append((
+                revocation.id,
+                revocation.grant_id,
+                revocation.token,
+                revocation.principal,
+                revocation.operation,
+                revocation.resource,
+                revocation.revoked_at,
+                revocation.revoked_by,
+                revocation.reason,
+            ))
+            
+            # Update grant in DB if persisted
+            if grant.scope == GrantScope.ALWAYS:
+                grant_rows.append((now, revoked_by, grant.id))
         
-        return True
+        if revocation_rows:
+            self._list_cache.clear()
+            with self._transaction():
+                # Buffered grant inserts first, so the UPDATE below finds them
+                self._write_pending()
+                self._conn.executemany(_INSERT_REVOCATION_SQL, revocation_rows)
+                if grant_rows:
+                    self._conn.executemany(_REVOKE_GRANT_SQL, grant_rows)
+        return len(revocation_rows)
     
-    def _persist_revocation(self, revocation: RevocationRecord) -> None:
-        """Persist a revocation to disk."""
-        with self._lock:
-            self._conn.execute(
-                """
-                INSERT INTO revocations 
-                (id, grant_id, token, principal, operation, resource, 
-                 revoked_at, revoked_by, reason)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    revocation.id,
-                    revocation.grant_id,
-                    revocation.token,
-                    revocation.principal,
-                    revocation.operation,
-                    revocation.resource,
-                    revocation.revoked_at,
-                    revocation.revoked_by,
-                    revocation.reason,
-                ),
-            )
-            self._conn.commit()
+    def _index_revocation(self, revocation: RevocationRecord) -> None:
+        """Add a revocation to the in-memory tables."""
+        self._revocations[revocation.id] = revocation
+        self._revoked_tokens.add(revocation.token)
     
     def is_token_revoked(self, token: str) -> bool:
         """Check if a capability token has been revoked.
         
         This is the key check that prevents resurrection after restart.
         """
-        for revocation in self._revocations.values():
-            if revocation.token == token:
-                return True
-        return False
+        return token in self._revoked_tokens
     
     # =========================================================================
     # Query Methods
@@ -534,17 +826,41 @@ class SessionManager:
         active_only: bool = True,
         since: Optional[float] = None,
     ) -> list[CapabilityGrant]:
-        """List grants with optional filters."""
+        """List grants with optional filters.
+        
+        Results are memoized per filter combination until the next grant or
+        revocation, or (for active_only) until the first listed grant expires.
+        """
+        key = (principal, active_only, since)
+        now = time.time()
+        cached = self._list_cache.get(key)
+        if cached is not None and now < cached[1]:
+            return list(cached[0])
+        
+        if principal:
+            candidates = self._grants_by_principal.get(principal, {}).values()
+        elif active_only:
+            candidates = self._active_grants.values()
+        else:
+            candidates = self._grants.values()
+        
+        valid_until = float("inf")
         results = []
-        for grant in self._grants.values():
-            if principal and grant.principal != principal:
-                continue
-            if active_only and not grant.is_active():
-                continue
+        for grant in candidates:
+            if active_only:
+                if not grant.is_active(now):
+                    continue
+                if grant.expires_at is not None and grant.expires_at < valid_until:
+                    valid_until = grant.expires_at
             if since and grant.granted_at < since:
                 continue
             results.append(grant)
-        return sorted(results, key=lambda g: g.granted_at, reverse=True)
+        results.sort(key=lambda g: g.granted_at, reverse=True)
+        
+        if len(self._list_cache) >= LIST_CACHE_MAX_ENTRIES:
+            self._list_cache.clear()
+        self._list_cache[key] = (results, valid_until)
+        return list(results)
     
     def list_revocations(
         self,
@@ -563,10 +879,7 @@ class SessionManager:
     
     def get_grant_by_token(self, token: str) -> Optional[CapabilityGrant]:
         """Get a grant by its capability token."""
-        for grant in self._grants.values():
-            if grant.token == token:
-                return grant
-        return None
+        return self._grants_by_token.get(token)
     
     def revoke_all_for_principal(self, principal: str, revoked_by: str) -> int:
         """Revoke all active grants for a principal.
@@ -574,9 +887,7 @@ class SessionManager:
         Returns:
             Number of grants revoked
         """
-        count = 0
-        for grant in list(self._grants.values()):
-            if grant.principal == principal and grant.is_active():
-                if self.revoke_grant(grant.id, revoked_by):
-                    count += 1
-        return count
+        grants = self._grants_by_principal.get(principal, {})
+        return self._revoke_grants(
+            [g for g in grants.values() if g.id in self._active_grants], revoked_by
+        )
@@ -18,8 +18,9 @@ What CANNOT be rolled back (external side effects):
 
 from __future__ import annotations
 
+import itertools
 import time
-import uuid
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
@@ -38,25 +39,73 @@ class TransactionState(Enum):
     ABORTED = "aborted"
 
 
-@dataclass
+# Transaction ids come from a process-wide counter seeded with the start
+# time in milliseconds shifted left 20 bits (the scheme session record ids
+# use), so ids stay unique across coordinators and across runs sharing an
+# audit database, and sort by start order.
+_tx_counter = itertools.count(time.time_ns() // 1_000_000 << 20)
+
+# Committed/aborted transactions kept for get_transaction(); older ones are
+# dropped. Their checkpoint state is released as soon as they end.
+MAX_FINISHED_TRANSACTIONS = 1024
+
+# A checkpoint this many deltas away from a full one is stored in full,
+# bounding the parent chain a rollback has to walk.
+CHECKPOINT_CHAIN_LIMIT = 16
+
+
+@dataclass(slots=True)
 class Checkpoint:
-    """A saved state snapshot within a transaction."""
+    """A saved state snapshot within a transaction.
+    
+    The first checkpoint of a chain holds every object's state in delta.
+    Later ones hold only the states that changed since their parent, plus
+    the ids of objects deleted since; the state property resolves them.
+    """
     id: str
     name: str
     tx_id: str
     timestamp: float
-    state: dict[str, "ObjectState"]
+    delta: dict[str, "ObjectState"]
+    parent: Optional["Checkpoint"] = None
+    removed: frozenset[str] = frozenset()
+    depth: int = 0  # Deltas between this checkpoint and a full one
+    
+    @property
+    def state(self) -> dict[str, "ObjectState"]:
+        """Full object state at this checkpoint."""
+        chain = []
+        cp = self
+        while cp is not None:
+            chain.append(cp)
+            cp = cp.parent
+        state: dict[str, "ObjectState"] = {}
+        for cp in reversed(chain):
+            for obj_id in cp.removed:
+                state.pop(obj_id, None)
+            state.update(cp.delta)
+        return state
     
     def __repr__(self) -> str:
         return f"Checkpoint({self.name!r}, objects={len(self.state)})"
 
 
-@dataclass
+# Name of the checkpoint taken by begin(); rollback(INITIAL_CHECKPOINT)
+# restores the start state. Reserved: user checkpoints can't take it.
+INITIAL_CHECKPOINT = "__initial__"
+
+
+@dataclass(slots=True)
 class Transaction:
-    """A transaction with checkpoints and commit/rollback semantics."""
+    """A transaction with checkpoints and commit/rollback semantics.
+    
+    The start-state checkpoint is kept apart from the named ones, so
+    checkpoints holds exactly the user's checkpoints in creation order.
+    """
     id: str
     state: TransactionState = TransactionState.ACTIVE
     checkpoints: dict[str, Checkpoint] = field(default_factory=dict)
+    initial_checkpoint: Optional[Checkpoint] = None
     operations: list[dict] = field(default_factory=list)
     started_at: float = field(default_factory=time.time)
     ended_at: Optional[float] = None
@@ -83,6 +132,11 @@ class CheckpointNotFound(TransactionError):
 class TransactionCoordinator:
     """Coordinates transactions with checkpoints and rollback.
     
+    begin/checkpoint/rollback are audited with log_async, so they never
+    write to the database on the caller's thread; their entries join the
+    buffered batch that the synchronous commit/abort entry (or the next
+    due flush) writes.
+    
     Usage:
         with coordinator.begin() as tx:
             tx.checkpoint('before-nav')
@@ -97,38 +151,68 @@ class TransactionCoordinator:
         self._objects = object_manager
         self._audit = audit_log
         self._transactions: dict[str, Transaction] = {}
+        self._finished: deque[str] = deque()  # ended tx ids, oldest first
         self._active_tx: Optional[str] = None
         self._checkpoint_counter = 0
+        # Latest object state captured or restored by any transaction; the
+        # next snapshot (including the next begin()) shares its states for
+        # objects still unchanged, so a transaction that touches nothing
+        # costs one comparison per object rather than a copy
+        self._last_snapshot: Optional[dict[str, "ObjectState"]] = None
+        # The checkpoint _last_snapshot resolves; parent of the next one.
+        # Every path that sets one of the pair must set the other
+        self._last_checkpoint: Optional[Checkpoint] = None
     
     def _next_checkpoint_id(self) -> str:
         self._checkpoint_counter += 1
         return f"cp:{self._checkpoint_counter}"
     
+    def _capture(self, name: str, tx_id: str, now: float) -> Checkpoint:
+        """Snapshot current state as a checkpoint, stored as a delta when possible.
+        
+        now stamps both the checkpoint and the object states it captures.
+        """
+        base = self._last_snapshot
+        state = self._objects.snapshot_all(base=base, now=now)
+        parent = self._last_checkpoint
+        if parent is None or parent.tx_id != tx_id or parent.depth >= CHECKPOINT_CHAIN_LIMIT:
+            parent, delta, removed = None, state, frozenset()
+        else:
+            # base is parent's resolved state; shared states are unchanged
+            delta = {obj_id: s for obj_id, s in state.items() if base.get(obj_id) is not s}
+            removed = frozenset(base.keys() - state.keys())
+        cp = Checkpoint(
+            id=self._next_checkpoint_id(),
+            name=name,
+            tx_id=tx_id,
+            timestamp=now,
+            delta=delta,
+            parent=parent,
+            removed=removed,
+            depth=parent.depth + 1 if parent else 0,
+        )
+        self._last_snapshot = state
+        self._last_checkpoint = cp
+        return cp
+    
     def begin(self) -> "TransactionContext":
         """Begin a new transaction.
         
         Returns:
             A TransactionContext for use with 'with' statement
         """
-        tx_id = f"tx:{uuid.uuid4().hex[:8]}"
-        tx = Transaction(id=tx_id)
+        tx_id = f"tx:{next(_tx_counter):016x}"
+        now = time.time()
+        tx = Transaction(id=tx_id, started_at=now)
         self._transactions[tx_id] = tx
         self._active_tx = tx_id
         
         # Create initial checkpoint (start state)
-        initial_state = self._objects.snapshot_all()
-        initial_cp = Checkpoint(
-            id=self._next_checkpoint_id(),
-            name="__initial__",
-            tx_id=tx_id,
-            timestamp=time.time(),
-            state=initial_state,
-        )
-        tx.checkpoints["__initial__"] = initial_cp
+        tx.initial_checkpoint = self._capture(INITIAL_CHECKPOINT, tx_id, now)
         
         if self._audit:
             self._audit.set_transaction_context(tx_id)
-            self._audit.log(
+            self._audit.log_async(
                 op="transaction.begin",
                 principal="system",
                 object=tx_id,
@@ -155,20 +239,15 @@ class TransactionCoordinator:
         tx = self._transactions.get(tx_id)
         if not tx or not tx.is_active():
             raise TransactionNotActive(f"Transaction {tx_id} is not active")
+        if name == INITIAL_CHECKPOINT:
+            raise TransactionError(f"Checkpoint name {name!r} is reserved")
         
-        state = self._objects.snapshot_all()
-        cp = Checkpoint(
-            id=self._next_checkpoint_id(),
-            name=name,
-            tx_id=tx_id,
-            timestamp=time.time(),
-            state=state,
-        )
+        cp = self._capture(name, tx_id, time.time())
         tx.checkpoints[name] = cp
         
         if self._audit:
             self._audit.set_transaction_context(tx_id, cp.id)
-            self._audit.log(
+            self._audit.log_async(
                 op="transaction.checkpoint",
                 principal="system",
                 object=tx_id,
@@ -193,15 +272,21 @@ class TransactionCoordinator:
         if not tx or not tx.is_active():
             raise TransactionNotActive(f"Transaction {tx_id} is not active")
         
-        cp = tx.checkpoints.get(checkpoint_name)
+        if checkpoint_name == INITIAL_CHECKPOINT:
+            cp = tx.initial_checkpoint
+        else:
+            cp = tx.checkpoints.get(checkpoint_name)
         if not cp:
             raise CheckpointNotFound(f"Checkpoint '{checkpoint_name}' not found")
         
         # Restore object state
-        self._objects.restore_snapshot(cp.state)
+        state = cp.state
+        self._objects.restore_snapshot(state)
+        self._last_snapshot = state
+        self._last_checkpoint = cp
         
         if self._audit:
-            self._audit.log(
+            self._audit.log_async(
                 op="transaction.rollback",
                 principal="system",
                 object=tx_id,
@@ -225,6 +310,7 @@ class TransactionCoordinator:
         
         tx.state = TransactionState.COMMITTED
         tx.ended_at = time.time()
+        self._finish(tx)
         
         if self._audit:
             self._audit.log(
@@ -253,14 +339,20 @@ class TransactionCoordinator:
         if not tx:
             raise TransactionError(f"Transaction {tx_id} not found")
         
-        if tx.is_active():
+        was_active = tx.is_active()
+        if was_active:
             # Restore to initial state
-            initial_cp = tx.checkpoints.get("__initial__")
+            initial_cp = tx.initial_checkpoint
             if initial_cp:
-                self._objects.restore_snapshot(initial_cp.state)
+                state = initial_cp.state
+                self._objects.restore_snapshot(state)
+                self._last_snapshot = state
+                self._last_checkpoint = initial_cp
         
         tx.state = TransactionState.ABORTED
         tx.ended_at = time.time()
+        if was_active:
+            self._finish(tx)
         
         if self._audit:
             self._audit.log(
@@ -275,6 +367,25 @@ class TransactionCoordinator:
         if self._active_tx == tx_id:
             self._active_tx = None
     
+    def _finish(self, tx: Transaction) -> None:
+        """Release an ended transaction's checkpoint state and add it to history.
+        
+        Nothing can roll back to these checkpoints any more; their names,
+        ids and timestamps are kept for inspection.
+        """
+        checkpoints = list(tx.checkpoints.values())
+        if tx.initial_checkpoint is not None:
+            checkpoints.append(tx.initial_checkpoint)
+        for cp in checkpoints:
+            cp.delta = {}
+            cp.parent = None
+            cp.removed = frozenset()
+        if self._last_checkpoint is not None and self._last_checkpoint.tx_id == tx.id:
+            self._last_checkpoint = None
+        self._finished.append(tx.id)
+        if len(self._finished) > MAX_FINISHED_TRANSACTIONS:
+            self._transactions.pop(self._finished.popleft(), None)
+    
     def get_transaction(self, tx_id: str) -> Optional[Transaction]:
         """Get a transaction by ID."""
         return self._transactions.get(tx_id)
@@ -293,12 +404,14 @@ class TransactionCoordinator:
         tx = self._transactions.get(tx_id)
         if not tx:
             return []
-        return [name for name in tx.checkpoints.keys() if name != "__initial__"]
+        return list(tx.checkpoints)
 
 
 class TransactionContext:
     """Context manager for transactions."""
     
+    __slots__ = ("_coordinator", "_tx", "_committed")
+    
     def __init__(self, coordinator: TransactionCoordinator, transaction: Transaction):
         self._coordinator = coordinator
         self._tx = transaction
@@ -316,7 +429,7 @@ class TransactionContext:
         """Create a named checkpoint."""
         return self._coordinator.checkpoint(name, self._tx.id)
     
-    def rollback(self, checkpoint_name: str = "__initial__") -> None:
+    def rollback(self, checkpoint_name: str = INITIAL_CHECKPOINT) -> None:
         """Roll back to a checkpoint (default: initial state)."""
         self._coordinator.rollback(checkpoint_name, self._tx.id)
     
@@ -24,8 +24,8 @@ from typing import Callable, Optional
 from kernel.capabilities import CapabilityBroker, CapabilityRisk, CapabilityDenied
 from kernel.objects import ObjectManager, ObjectType
 from kernel.audit import AuditLog, Provenance
-from kernel.transactions import TransactionCoordinator
-from kernel.runtime import AgentRuntime, ExecutionState, ImportValidator
+from kernel.transactions import INITIAL_CHECKPOINT, TransactionCoordinator
+from kernel.runtime import AgentRuntime, ExecutionState
 
 
 class Color:
@@ -499,11 +499,9 @@ class TerminalUI:
         print(f"  State: {active.state.value}")
         print(f"  Started: {time.strftime('%H:%M:%S', time.localtime(active.started_at))}")
         
-        checkpoints = [name for name in active.checkpoints.keys() if name != "__initial__"]
-        if checkpoints:
+        if active.checkpoints:
             print(f"\n  Checkpoints:")
-            for cp_name in checkpoints:
-                cp = active.checkpoints[cp_name]
+            for cp_name, cp in active.checkpoints.items():
                 print(f"    • {cp_name} ({len(cp.state)} objects)")
     
     def _cmd_approve(self, args: list[str]) -> None:
@@ -530,7 +528,7 @@ class TerminalUI:
             print(colored("No active transaction", Color.YELLOW))
             return
         
-        checkpoint = args[0] if args else "__initial__"
+        checkpoint = args[0] if args else INITIAL_CHECKPOINT
         try:
             self._transactions.rollback(checkpoint)
             print(colored(f"Rolled back to checkpoint: {checkpoint}", Color.GREEN))
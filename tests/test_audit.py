@@ -1,6 +1,7 @@
 """Tests for the Audit Log."""
 
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 import pytest
@@ -234,6 +235,7 @@ class TestAuditLog:
             # Write
             audit1 = AuditLog(db_path=db_path)
             audit1.log(op="test", principal="p", object="o", args={"url": "https://example.com"})
+            audit1.flush()
             
             # Read with new instance
             audit2 = AuditLog(db_path=db_path)
@@ -274,3 +276,273 @@ class TestAuditLog:
         
         assert audit.count() == 3
         assert audit.count(op="tab.*") == 2
+
+    
+    def test_log_is_buffered_until_flush(self):
+        """Entries are buffered and written in one batch on flush()."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+        
+        try:
+            writer = AuditLog(db_path=db_path, flush_every=100, flush_interval=3600)
+            writer.log(op="op1", principal="p", object="o")
+            writer.log(op="op2", principal="p", object="o")
+            
+            assert AuditLog(db_path=db_path).count() == 0
+            
+            writer.flush()
+            
+            assert AuditLog(db_path=db_path).count() == 2
+        finally:
+            Path(db_path).unlink(missing_ok=True)
+    
+    def test_flush_every_threshold(self):
+        """Reaching flush_every writes the buffered batch."""
+        audit = AuditLog(flush_every=3, flush_interval=3600)
+        for i in range(3):
+            audit.log(op=f"op{i}", principal="p", object="o")
+        
+        assert audit._pending == []
+    
+    def test_due_log_is_written_before_returning(self):
+        """A due log() waits out a flush in progress and returns with its row written."""
+        import threading
+        import time
+        audit = AuditLog(flush_every=1, flush_interval=3600)
+        held = threading.Event()
+        
+        def hold_lock():
+            with audit._lock:
+                held.set()
+                time.sleep(0.1)
+        
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        held.wait(5)
+        audit.log(op="op", principal="p", object="o")
+        
+        assert audit._pending == []
+        assert audit._conn.execute("SELECT op FROM audit_log").fetchall() == [("op",)]
+        thread.join()
+    
+    def test_flush_after_close_is_a_noop(self):
+        """A background flush racing close() doesn't touch the closed connection."""
+        audit = AuditLog()
+        audit.close()
+        
+        audit.flush()
+        
+        assert audit.closed
+    
+    def test_concurrent_logs_all_written(self):
+        """Rows appended while another thread flushes end up in a batch."""
+        import threading
+        audit = AuditLog(flush_every=5, flush_interval=3600)
+        
+        def worker(n):
+            for i in range(200):
+                audit.log(op="op", principal=f"p{n}", object=str(i))
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert audit.count() == 800
+    
+    def test_query_sees_buffered_entries(self):
+        """query() flushes pending entries before reading."""
+        audit = AuditLog(flush_every=100, flush_interval=3600)
+        audit.log(op="op1", principal="p", object="o")
+        
+        assert len(audit.query()) == 1
+    
+    def test_log_many(self):
+        """log_many() records a burst of entries in order."""
+        audit = AuditLog()
+        
+        entries = audit.log_many([
+            {"op": "tab.open", "principal": "agent:1", "object": "tab:1"},
+            {"op": "form.fill", "principal": "agent:1", "object": "form:1",
+             "args": {"password": "hunter2"}},
+        ])
+        
+        assert [e.op for e in entries] == ["tab.open", "form.fill"]
+        assert entries[1].args["password"] == "[REDACTED]"
+        assert [e.op for e in audit.query()] == ["tab.open", "form.fill"]
+    
+    def test_file_db_uses_wal(self):
+        """Disk-backed logs use WAL journaling with NORMAL sync."""
+        with tempfile.TemporaryDirectory() as tmp:
+            audit = AuditLog(db_path=Path(tmp) / "audit.db")
+            
+            journal_mode = audit._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = audit._conn.execute("PRAGMA synchronous").fetchone()[0]
+            
+            assert journal_mode == "wal"
+            assert synchronous == 1  # NORMAL
+    
+    def test_log_async_flushed_by_background_writer(self):
+        """log_async() hands due flushes to the writer thread."""
+        import time
+        audit = AuditLog(flush_every=2, flush_interval=3600)
+        
+        audit.log_async(op="op1", principal="p", object="o")
+        audit.log_async(op="op2", principal="p", object="o")
+        
+        deadline = time.monotonic() + 2.0
+        while audit._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert audit._pending == []
+        assert [e.op for e in audit.query()] == ["op1", "op2"]
+    
+    def test_log_async_visible_to_query(self):
+        """Entries logged asynchronously are visible to the next query."""
+        audit = AuditLog(flush_every=100, flush_interval=3600)
+        audit.set_transaction_context("tx:1")
+        
+        audit.log_async(op="capability.check", principal="p", object="o", result="allowed")
+        
+        entries = audit.query(tx_id="tx:1")
+        assert len(entries) == 1
+        assert entries[0].result == "allowed"
+    
+    def test_non_json_args_are_stringified(self):
+        """Args that aren't JSON-serializable are stored as strings."""
+        audit = AuditLog()
+        audit.log(op="test", principal="p", object="o", args={"path": Path("/tmp/x")})
+        
+        entries = audit.query()
+        
+        assert entries[0].args["path"] == "/tmp/x"
+    
+    def test_count_is_not_capped_by_query_limit(self):
+        """count() counts in SQL and is uncapped unless a limit is given."""
+        audit = AuditLog()
+        audit.log_many([{"op": "op", "principal": "p", "object": "o"}] * 1200)
+        
+        assert audit.count() == 1200
+        assert audit.count(limit=10) == 10
+    
+    def test_op_prefix_filter_is_case_sensitive(self):
+        """Prefix filters compare op case-sensitively (range, not LIKE)."""
+        audit = AuditLog()
+        audit.log(op="tab.read", principal="p", object="o")
+        audit.log(op="Tab.read", principal="p", object="o")
+        
+        assert [e.op for e in audit.query(op="tab.*")] == ["tab.read"]
+        assert audit.count(op="Tab.*") == 1
+    
+    def test_query_iter_streams_entries(self):
+        """query_iter() yields the same entries as query()."""
+        audit = AuditLog()
+        for i in range(300):
+            audit.log(op=f"op{i}", principal="p", object="o")
+        
+        streamed = [e.op for e in audit.query_iter(limit=500)]
+        
+        assert streamed == [e.op for e in audit.query(limit=500)]
+        assert len(streamed) == 300
+    
+    def test_query_operation_prefix_is_literal(self):
+        """Operation prefixes match literally (no LIKE wildcards) and use the op index."""
+        audit = AuditLog()
+        audit.log(op="tab_x.read", principal="p", object="o")
+        audit.log(op="tabsx.read", principal="p", object="o")
+        
+        assert [e.op for e in audit.query(op="tab_*")] == ["tab_x.read"]
+        assert audit.count(op="*") == 2
+        
+        plan = audit._conn.execute(
+            "EXPLAIN QUERY PLAN " + audit._statement(
+                "SELECT id FROM audit_log WHERE {where}", ("op >= ? AND op < ?",)
+            ),
+            ("tab.", "tab/"),
+        ).fetchall()
+        assert any("idx_audit_op" in row[-1] for row in plan)
+    
+    def test_file_db_reads_use_per_thread_connection(self):
+        """File-backed logs read through a per-thread connection."""
+        import threading
+        with tempfile.TemporaryDirectory() as tmp:
+            audit = AuditLog(db_path=Path(tmp) / "audit.db")
+            audit.log(op="op1", principal="p", object="o")
+            
+            counts = []
+            reader = threading.Thread(target=lambda: counts.append(audit.count()))
+            reader.start()
+            reader.join()
+            
+            assert counts == [1]
+            assert audit.count() == 1
+            assert audit._local.conn is not audit._conn
+    
+    def test_query_results_share_interned_strings(self):
+        """Repeated principal/op values in results are a single object."""
+        audit = AuditLog()
+        for _ in range(3):
+            audit.log(op="capability.check", principal="agent:1", object="o")
+        
+        entries = audit.query()
+        
+        assert entries[0].principal is entries[2].principal
+        assert entries[0].op is entries[2].op
+    
+    def test_ids_are_time_ordered(self):
+        """Entry ids are UUIDv7-style and sort by creation time."""
+        import time
+        import uuid
+        audit = AuditLog()
+        
+        first = audit.log(op="op1", principal="p", object="o")
+        time.sleep(0.002)
+        second = audit.log(op="op2", principal="p", object="o")
+        
+        assert uuid.UUID(first.id).version == 7
+        assert first.id < second.id
+        assert [e.id for e in audit.query()] == [first.id, second.id]
+    
+    def test_context_manager_flushes_and_closes(self):
+        """Leaving a with-block flushes buffered entries and closes the log."""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "audit.db"
+            
+            with AuditLog(db_path=db_path, flush_every=100, flush_interval=3600) as audit:
+                audit.log(op="op1", principal="p", object="o")
+            
+            assert audit.closed
+            audit.close()  # idempotent
+            assert AuditLog(db_path=db_path).count() == 1
+    
+    def test_close_releases_exit_hook_and_all_readers(self):
+        """close() drops the log from the exit registry and closes every reader."""
+        import threading
+        import time
+        from kernel.audit import _open_logs
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            audit = AuditLog(db_path=Path(tmp) / "audit.db")
+            audit.log(op="op1", principal="p", object="o")
+            done = threading.Event()
+            
+            def read_and_wait():
+                audit.count()
+                done.wait(5)
+            
+            thread = threading.Thread(target=read_and_wait)
+            thread.start()
+            audit.count()
+            while len(audit._readers) < 2:
+                time.sleep(0.01)
+            readers = [conn for _, conn in audit._readers]
+            assert audit in _open_logs
+            
+            audit.close()
+            done.set()
+            thread.join()
+            
+            assert audit not in _open_logs
+            for conn in readers:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
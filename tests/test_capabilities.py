@@ -168,3 +168,98 @@ class TestCapabilityBroker:
         
         assert cap.constraints["url_pattern"] == "https://example.com/*"
         assert cap.constraints["rate_limit"] == 10
+    
+    def test_check_across_operation_namespaces(self):
+        """Grants in other namespaces don't match; '*' grants match everywhere."""
+        broker = CapabilityBroker()
+        broker.grant("agent:1", "tab.read", "*")
+        
+        assert broker.check("agent:1", "form.read", "form:1") is False
+        
+        broker.grant("agent:1", "*", "form:1")
+        
+        assert broker.check("agent:1", "form.read", "form:1") is True
+        assert broker.check("agent:1", "form.read", "form:2") is False
+    
+    def test_check_cache_invalidated_by_grant_and_revoke(self):
+        """Memoized check results never outlive a grant or revoke."""
+        broker = CapabilityBroker()
+        
+        assert broker.check("agent:1", "tab.read", "tab:1") is False
+        cap = broker.grant("agent:1", "tab.read", "tab:1")
+        assert broker.check("agent:1", "tab.read", "tab:1") is True
+        broker.revoke(cap.token)
+        assert broker.check("agent:1", "tab.read", "tab:1") is False
+    
+    def test_expired_capabilities_are_evicted(self):
+        """check() evicts expired capabilities from the broker's indexes."""
+        broker = CapabilityBroker()
+        cap = broker.grant("agent:1", "tab.read", "tab:1", ttl_seconds=0.01)
+        broker.grant("agent:1", "tab.read", "tab:2")
+        
+        time.sleep(0.02)
+        
+        assert broker.check("agent:1", "tab.read", "tab:1") is False
+        assert broker.revoke(cap.token) is False
+        assert [c.resource for c in broker.list_capabilities("agent:1")] == ["tab:2"]
+    
+    def test_tokens_unique_across_pool_refills(self):
+        """Pooled token generation never repeats a token."""
+        broker = CapabilityBroker()
+        
+        tokens = {broker.grant("agent:1", "tab.read", f"tab:{i}").token for i in range(500)}
+        
+        assert len(tokens) == 500
+        assert all(len(t) == 43 for t in tokens)
+    
+    def test_require_returns_matching_capability(self):
+        """require() returns the capability that permits the operation."""
+        broker = CapabilityBroker()
+        cap = broker.grant("agent:1", "tab.*", "*")
+        
+        assert broker.require("agent:1", "tab.close", "tab:9") is cap
+        with pytest.raises(CapabilityDenied):
+            broker.require("agent:1", "form.submit", "form:1")
+    
+    def test_revoke_prunes_empty_namespace_buckets(self):
+        """Revoking the last grant in a namespace drops it from the index."""
+        broker = CapabilityBroker()
+        cap = broker.grant("agent:1", "form.fill", "*")
+        broker.grant("agent:1", "tab.read", "*")
+        
+        broker.revoke(cap.token)
+        
+        assert set(broker._by_principal_op["agent:1"]) == {"tab"}
+        assert broker.check("agent:1", "form.fill", "form:1") is False
+    
+    def test_capability_patterns_compiled_once_and_picklable(self):
+        """Pattern pairs compile once for all capabilities; caps stay picklable."""
+        import pickle
+        from kernel.capabilities import _compile_matcher
+        
+        broker = CapabilityBroker()
+        cap = broker.grant("agent:1", "tab.*", "zz:*")
+        broker.grant("agent:2", "tab.*", "zz:*")
+        before = _compile_matcher.cache_info().misses
+        
+        assert cap.matches("tab.read", "zz:1") is True
+        assert broker.check("agent:2", "tab.close", "zz:2") is True
+        assert cap.matches("form.fill", "zz:1") is False
+        
+        assert _compile_matcher.cache_info().misses - before <= 1
+        assert pickle.loads(pickle.dumps(cap)) == cap
+    
+    def test_denial_is_on_disk_before_check_returns(self, tmp_path):
+        """A denied check's audit entry is flushed, not left in the buffer."""
+        from kernel.audit import AuditLog
+        
+        db = tmp_path / "audit.db"
+        audit = AuditLog(db)
+        broker = CapabilityBroker(audit_log=audit)
+        
+        assert broker.check("agent:1", "tab.read", "tab:1") is False
+        
+        reader = AuditLog(db)
+        assert [e.result for e in reader.query(op="capability.check")] == ["denied"]
+        reader.close()
+        audit.close()
@@ -99,6 +99,32 @@ class TestObjectManager:
         
         assert len(results) == 1
         assert results[0].url == "https://a.com"
+    
+    def test_query_with_multiple_filters(self):
+        """Every filter must match; missing keys compare as None."""
+        mgr = ObjectManager()
+        mgr.create(ObjectType.FORM, tab_id="tab:1", form_type="login")
+        mgr.create(ObjectType.FORM, tab_id="tab:1", form_type="search")
+        mgr.create(ObjectType.FORM, tab_id="tab:2", form_type="login")
+        
+        results = mgr.query(obj_type=ObjectType.FORM, tab_id="tab:1", form_type="login")
+        
+        assert [f.id for f in results] == ["form:1"]
+        assert mgr.query(obj_type=ObjectType.FORM, action=None, tab_id="tab:2")[0].id == "form:3"
+        assert mgr.query(obj_type=ObjectType.FORM, tab_id="tab:9", form_type="login") == []
+    
+    def test_type_index_tracks_deletes(self):
+        """list_by_type and query drop deleted objects."""
+        mgr = ObjectManager()
+        mgr.create(ObjectType.TAB, url="https://a.com")
+        mgr.create(ObjectType.TAB, url="https://b.com")
+        mgr.create(ObjectType.FORM, tab_id="tab:1")
+        
+        mgr.delete("tab:1")
+        
+        assert [t.id for t in mgr.list_by_type("tab")] == ["tab:2"]
+        assert [o.id for o in mgr.query(obj_type=ObjectType.TAB)] == ["tab:2"]
+        assert [o.id for o in mgr.query(tab_id="tab:1")] == ["form:1"]
 
 
 class TestTab:
@@ -146,6 +172,26 @@ class TestForm:
         assert form._data["filled"]["email"] == "test@example.com"
         assert form._data["filled"]["password"] == "secret"
     
+    def test_form_type_is_interned(self):
+        """Form types built at runtime share one string object."""
+        mgr = ObjectManager()
+        a = mgr.create(ObjectType.FORM, tab_id="tab:1", form_type="".join(["log", "in"]))
+        b = mgr.create(ObjectType.FORM, tab_id="tab:1", form_type="".join(["lo", "gin"]))
+        
+        assert a.form_type is b.form_type
+    
+    def test_to_dict_does_not_leak_nested_state(self):
+        """Mutating to_dict() output leaves the form's filled values intact."""
+        mgr = ObjectManager()
+        form = mgr.create(ObjectType.FORM, tab_id="tab:1", form_type="login")
+        form.fill({"email": "a@example.com"})
+        
+        data = form.to_dict()
+        data["data"]["filled"]["email"] = "evil@example.com"
+        
+        assert data["type"] == "form"
+        assert form.get("filled") == {"email": "a@example.com"}
+    
     def test_form_clear(self):
         """Form.clear removes filled values."""
         mgr = ObjectManager()
@@ -190,6 +236,34 @@ class TestWorkspace:
         ws.add_tab("tab:1")
         
         assert ws.tabs == ["tab:1"]
+    
+    def test_workspace_tabs_keep_insertion_order(self):
+        """Re-adding a removed tab appends it; snapshots restore the set."""
+        mgr = ObjectManager()
+        ws = mgr.create(ObjectType.WORKSPACE, name="work")
+        for tab_id in ("tab:1", "tab:2", "tab:3"):
+            ws.add_tab(tab_id)
+        snapshot = ws.snapshot()
+        
+        ws.remove_tab("tab:1")
+        ws.add_tab("tab:1")
+        assert ws.tabs == ["tab:2", "tab:3", "tab:1"]
+        
+        ws.restore(snapshot)
+        assert ws.tabs == ["tab:1", "tab:2", "tab:3"]
+    
+    def test_workspace_serializes_tabs_as_list(self):
+        """to_dict() and get('tabs') expose tabs as a JSON list of ids."""
+        import json
+        mgr = ObjectManager()
+        ws = mgr.create(ObjectType.WORKSPACE, name="work")
+        ws.add_tab("tab:1")
+        ws.add_tab("tab:2")
+        
+        data = ws.to_dict()["data"]
+        assert data["tabs"] == ["tab:1", "tab:2"]
+        assert json.loads(json.dumps(data))["tabs"] == ["tab:1", "tab:2"]
+        assert ws.get("tabs") == ["tab:1", "tab:2"]
 
 
 class TestSnapshot:
@@ -244,3 +318,196 @@ class TestSnapshot:
         
         assert tab1.url == "https://a.com"
         assert tab2.url == "https://b.com"
+    
+    def test_restore_does_not_alias_snapshot(self):
+        """Mutating restored data leaves the snapshot intact for later restores."""
+        mgr = ObjectManager()
+        form = mgr.create(ObjectType.FORM, tab_id="tab:1")
+        form.fill({"name": "Alice"})
+        
+        snapshot = form.snapshot()
+        form.restore(snapshot)
+        form.fill({"name": "Bob"})
+        form.restore(snapshot)
+        
+        assert form.get("filled") == {"name": "Alice"}
+    
+    def test_large_subtree_restore_is_independent_copy(self):
+        """Large subtrees are referenced by the snapshot and copied on restore."""
+        mgr = ObjectManager()
+        tab = mgr.create(ObjectType.TAB, url="https://a.com")
+        dom = {"items": [{"id": i, "text": f"{i:050d}"} for i in range(500)]}
+        tab._data["dom"] = dom
+        
+        snapshot = tab.snapshot()
+        tab.restore(snapshot)
+        tab._data["dom"]["items"].clear()
+        
+        assert "dom" in snapshot.large_refs
+        assert len(dom["items"]) == 500
+        assert tab.get("dom") == {"items": []}
+    
+    def test_snapshot_copies_unpicklable_values(self):
+        """Containers the pickler rejects are still deep copied."""
+        mgr = ObjectManager()
+        tab = mgr.create(ObjectType.TAB, url="https://a.com")
+        tab._data["extra"] = {"callback": lambda: None, "tags": ["a"]}
+        
+        snapshot = tab.snapshot()
+        tab._data["extra"]["tags"].append("b")
+        
+        assert snapshot.data["extra"]["tags"] == ["a"]
+    
+    def test_snapshot_all_shares_timestamp(self):
+        """snapshot_all stamps every object state with one timestamp."""
+        mgr = ObjectManager()
+        for i in range(5):
+            mgr.create(ObjectType.TAB, url=f"https://{i}.com")
+        
+        snapshot = mgr.snapshot_all()
+        
+        assert len({state.timestamp for state in snapshot.values()}) == 1
+    
+    def test_snapshot_all_shares_unchanged_states(self):
+        """States of unchanged objects are reused from the base snapshot."""
+        mgr = ObjectManager()
+        tab1 = mgr.create(ObjectType.TAB, url="https://a.com")
+        mgr.create(ObjectType.TAB, url="https://b.com")
+        base = mgr.snapshot_all()
+        
+        tab1.navigate("https://changed.com")
+        snapshot = mgr.snapshot_all(base=base)
+        
+        assert snapshot["tab:2"] is base["tab:2"]
+        assert snapshot["tab:1"] is not base["tab:1"]
+        assert snapshot["tab:1"].data["url"] == "https://changed.com"
+    
+    def test_snapshot_all_detects_direct_data_writes(self):
+        """Writes that bypass the object's methods still force a new state."""
+        mgr = ObjectManager()
+        form = mgr.create(ObjectType.FORM, tab_id="tab:1")
+        base = mgr.snapshot_all()
+        
+        form._data["filled"]["name"] = "Alice"
+        snapshot = mgr.snapshot_all(base=base)
+        mgr.restore_snapshot(base)
+        
+        assert snapshot["form:1"].data["filled"] == {"name": "Alice"}
+        assert form.get("filled") == {}
+
+
+class TestListeners:
+    """Tests for object update listeners."""
+    
+    def test_listener_receives_updates_until_removed(self):
+        """Listeners see updates and stop after remove_listener."""
+        mgr = ObjectManager()
+        tab = mgr.create(ObjectType.TAB, url="https://a.com")
+        seen = []
+        listener = lambda event, obj: seen.append((event, obj.id))
+        
+        mgr.add_listener(listener)
+        tab.navigate("https://b.com")
+        assert mgr.remove_listener(listener) is True
+        tab.navigate("https://c.com")
+        
+        assert seen == [("update", "tab:1")]
+        assert mgr.remove_listener(listener) is False
+    
+    def test_generic_create_and_empty_update_do_not_notify(self):
+        """Creating a generic object or an empty update() fires no update event."""
+        mgr = ObjectManager()
+        seen = []
+        mgr.add_listener(lambda event, obj: seen.append(obj.id))
+        
+        download = mgr.create(ObjectType.DOWNLOAD, path="/tmp/report.pdf")
+        download.update()
+        
+        assert download.get("path") == "/tmp/report.pdf"
+        assert seen == []
+    
+    def test_listener_errors_propagate(self):
+        """A failing listener surfaces its exception instead of being swallowed."""
+        mgr = ObjectManager()
+        tab = mgr.create(ObjectType.TAB)
+        
+        def broken(event, obj):
+            raise RuntimeError("listener bug")
+        
+        mgr.add_listener(broken)
+        with pytest.raises(RuntimeError):
+            tab.set("title", "x")
+
+
+class TestConcurrency:
+    """Tests for ObjectManager under concurrent use."""
+    
+    def test_concurrent_creates_get_unique_ids(self):
+        """IDs stay unique when tabs are created from many threads."""
+        import threading
+        
+        mgr = ObjectManager()
+        
+        def worker():
+            for _ in range(200):
+                mgr.create(ObjectType.TAB)
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        ids = [t.id for t in mgr.list_by_type(ObjectType.TAB)]
+        assert len(ids) == 1600
+        assert len(set(ids)) == 1600
+    
+    def test_reads_tolerate_concurrent_writes(self):
+        """query and snapshot_all never fail while another thread creates/deletes."""
+        import threading
+        
+        mgr = ObjectManager()
+        for i in range(50):
+            mgr.create(ObjectType.TAB, url=f"https://{i}.com")
+        stop = threading.Event()
+        errors = []
+        
+        def writer():
+            while not stop.is_set():
+                tab = mgr.create(ObjectType.TAB, url="https://x.com")
+                mgr.delete(tab.id)
+        
+        def reader():
+            try:
+                for _ in range(300):
+                    mgr.query(url="https://x.com")
+                    mgr.snapshot_all()
+            except Exception as e:
+                errors.append(e)
+        
+        w = threading.Thread(target=writer)
+        w.start()
+        reader()
+        stop.set()
+        w.join()
+        
+        assert errors == []
+        assert len(mgr.list_by_type(ObjectType.TAB)) == 50
+
+
+class TestSlots:
+    """Tests for slotted managed objects."""
+    
+    def test_objects_have_no_instance_dict(self):
+        """Tabs, forms and workspaces carry no per-instance __dict__."""
+        mgr = ObjectManager()
+        objs = [
+            mgr.create(ObjectType.TAB, url="https://a.com"),
+            mgr.create(ObjectType.FORM, tab_id="tab:1"),
+            mgr.create(ObjectType.WORKSPACE, name="w"),
+            mgr.create(ObjectType.DOWNLOAD, path="/tmp/x"),
+        ]
+        
+        for obj in objs:
+            assert not hasattr(obj, "__dict__")
+        assert objs[3].get("path") == "/tmp/x"
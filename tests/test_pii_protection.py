@@ -235,3 +235,41 @@ class TestAuditLogGDPRCompliance:
             assert "phone" not in exported_str.lower() or "[PII:" in exported_str
         finally:
             Path(filepath).unlink(missing_ok=True)
+
+
+class TestRedactionFastPath:
+    """Tests for the no-op redaction fast path."""
+    
+    def test_clean_args_are_copied_not_shared(self):
+        """Args without sensitive keys are stored as an independent copy."""
+        audit = AuditLog(workspace_salt="test")
+        args = {"operation": "tab.read"}
+        
+        entry = audit.log(op="capability.check", principal="p", object="o", args=args)
+        args["operation"] = "mutated"
+        
+        assert entry.args == {"operation": "tab.read"}
+    
+    def test_nested_field_lists_still_hashed(self):
+        """Field-name lists nested under 'fields' keep PII hashing."""
+        audit = AuditLog(workspace_salt="test")
+        
+        entry = audit.log(
+            op="form.fill", principal="p", object="o",
+            args={"fields": {"names": ["email", "ssn"]}},
+        )
+        
+        fields = entry.args["fields"]["names"]
+        assert fields[0] == "email"
+        assert fields[1].startswith("[PII:")
+    
+    def test_cached_plan_respects_hashing_toggle(self):
+        """Disabling hashing after a key set was seen takes effect immediately."""
+        audit = AuditLog(workspace_salt="test")
+        
+        hashed = audit.log(op="form.fill", principal="p", object="o", args={"phone": "555"})
+        audit._hash_field_names = False
+        plain = audit.log(op="form.fill", principal="p", object="o", args={"phone": "555"})
+        
+        assert "phone" not in hashed.args
+        assert plain.args == {"phone": "555"}
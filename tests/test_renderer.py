@@ -1,5 +1,6 @@
 """Tests for the Mock Renderer."""
 
+import time
 import pytest
 from kernel.objects import ObjectManager, ObjectType, Tab
 from kernel.audit import AuditLog
@@ -31,6 +32,15 @@ class TestMockForm:
         assert "name" in form.fields
         assert "email" in form.fields
         assert "message" in form.fields
+    
+    def test_standard_form_fields_are_shared_read_only(self):
+        """Standard forms share one read-only field template."""
+        a = MockForm.login_form("form:1")
+        b = MockForm.login_form("form:2")
+        
+        assert a.fields is b.fields
+        with pytest.raises(TypeError):
+            a.fields["email"]["required"] = False
 
 
 class TestMockPage:
@@ -122,6 +132,25 @@ class TestMockSiteRegistry:
         
         retrieved = registry.get_page("https://custom.site.com/page")
         assert retrieved.title == "Custom Page"
+    
+    def test_get_page_ignores_query_and_fragment(self):
+        """Lookup keys on host and path only."""
+        registry = MockSiteRegistry()
+        
+        assert registry.get_page("https://example.com/login?next=/home#top").title == "Login - Example"
+        assert registry.get_page("https://example.com").title == "Example Domain"
+        assert registry.get_page("about:blank") is None
+    
+    def test_registered_pages_do_not_leak_between_registries(self):
+        """Default pages are shared, but registrations stay per-instance."""
+        a = MockSiteRegistry()
+        b = MockSiteRegistry()
+        
+        a.register_page(MockPage(url="https://example.com/private", title="Private", content=""))
+        
+        assert a.get_page("https://example.com/") is b.get_page("https://example.com/")
+        assert a.get_page("https://example.com/private") is not None
+        assert b.get_page("https://example.com/private") is None
 
 
 class TestMockRenderer:
@@ -153,6 +182,25 @@ class TestMockRenderer:
         assert result["success"] is True
         assert "404" in result["title"]
     
+    def test_navigate_latency_is_opt_in(self):
+        """Navigation is instant unless latency simulation is enabled."""
+        tab = self.objects.create(ObjectType.TAB, url="about:blank")
+        page = MockPage(url="https://slow.example.com/", title="Slow", content="", load_time_ms=200.0)
+        self.renderer.register_page(page)
+        
+        start = time.perf_counter()
+        result = self.renderer.navigate(tab.id, "https://slow.example.com/")
+        
+        assert time.perf_counter() - start < 0.1
+        assert result["load_time_ms"] == 200.0
+        
+        slow = MockRenderer(self.objects, self.audit, simulate_latency=True)
+        slow.register_page(page)
+        start = time.perf_counter()
+        slow.navigate(tab.id, "https://slow.example.com/")
+        
+        assert time.perf_counter() - start >= 0.2
+    
     def test_navigate_nonexistent_tab(self):
         """Navigation fails for nonexistent tab."""
         result = self.renderer.navigate("tab:999", "https://example.com/")
@@ -190,6 +238,32 @@ class TestMockRenderer:
         assert len(result["forms"]) == 1
         assert result["forms"][0]["type"] == "login"
     
+    def test_extract_tables_and_unknown_type(self):
+        """Extract dispatches tables and rejects unknown types."""
+        tab = self.objects.create(ObjectType.TAB, url="about:blank")
+        self.renderer.navigate(tab.id, "https://data.example.com/")
+        
+        assert self.renderer.extract(tab.id, "tables")["tables"][0]["headers"][0] == "Name"
+        assert "Unknown extract type" in self.renderer.extract(tab.id, "screenshots")["error"]
+    
+    def test_mutating_extract_results_leaves_shared_pages_intact(self):
+        """Extract results are copies; default pages are shared by all renderers."""
+        tab = self.objects.create(ObjectType.TAB, url="about:blank")
+        self.renderer.navigate(tab.id, "https://example.com/")
+        self.renderer.extract(tab.id, "links")["links"][0]["href"] = "https://evil.test/"
+        self.renderer.navigate(tab.id, "https://data.example.com/")
+        self.renderer.extract(tab.id, "tables")["tables"][0]["rows"].clear()
+        
+        other = MockRenderer(ObjectManager())
+        other_tab = other._objects.create(ObjectType.TAB, url="about:blank")
+        other.navigate(other_tab.id, "https://example.com/")
+        links = other.extract(other_tab.id, "links")["links"]
+        other.navigate(other_tab.id, "https://data.example.com/")
+        tables = other.extract(other_tab.id, "tables")["tables"]
+        
+        assert links[0]["href"] == "https://www.iana.org/domains/example"
+        assert len(tables[0]["rows"]) == 3
+    
     def test_find_form(self):
         """find_form creates Form object."""
         tab = self.objects.create(ObjectType.TAB, url="about:blank")
@@ -244,6 +318,15 @@ class TestMockRenderer:
         assert result["success"] is True
         assert result["submitted"] is True
     
+    def test_form_operations_reject_non_form_ids(self):
+        """Form operations on a tab ID report the form as not found."""
+        tab = self.objects.create(ObjectType.TAB, url="about:blank")
+        
+        assert self.renderer.fill_form(tab.id, {"q": "x"})["success"] is False
+        assert self.renderer.clear_form(tab.id)["success"] is False
+        assert self.renderer.submit_form(tab.id)["success"] is False
+        assert self.renderer.navigate("form:1", "https://example.com/")["success"] is False
+    
     def test_submit_callback(self):
         """submit_form calls callback if set."""
         tab = self.objects.create(ObjectType.TAB, url="about:blank")
@@ -317,6 +400,23 @@ class TestRendererKernelIntegration:
         assert len(forms) == 1
         assert forms[0]._data["filled"]["email"] == "test@example.com"
     
+    def test_submit_sees_restored_fill_state(self):
+        """submit_form reads filled values from the form, so rollbacks apply."""
+        tab = self.objects.create(ObjectType.TAB, url="about:blank")
+        self.renderer.navigate(tab.id, "https://example.com/login")
+        form_id = self.renderer.find_form(tab.id, "login")
+        self.renderer.fill_form(form_id, {"email": "a@example.com"})
+        
+        snapshot = self.objects.snapshot_all()
+        self.renderer.fill_form(form_id, {"password": "secret"})
+        self.objects.restore_snapshot(snapshot)
+        
+        submitted = {}
+        self.renderer.set_submit_callback(lambda fid, filled: submitted.update(filled) or {"success": True})
+        self.renderer.submit_form(form_id)
+        
+        assert submitted == {"email": "a@example.com"}
+    
     def test_snapshot_captures_renderer_state(self):
         """Snapshots capture renderer-driven state changes."""
         tab = self.objects.create(ObjectType.TAB, url="about:blank")
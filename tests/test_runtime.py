@@ -1,11 +1,14 @@
 """Tests for the Agent Runtime."""
 
+import sys
+import time
+
 import pytest
-from kernel.capabilities import CapabilityBroker, CapabilityRisk
+from kernel.capabilities import CapabilityBroker, CapabilityDenied, CapabilityRisk
 from kernel.objects import ObjectManager, ObjectType
 from kernel.audit import AuditLog
 from kernel.transactions import TransactionCoordinator
-from kernel.runtime import AgentRuntime, ExecutionState, BrowserAPI
+from kernel.runtime import AgentRuntime, ExecutionState, BrowserAPI, IPCClient, IPCServer
 
 
 class TestAgentRuntime:
@@ -52,12 +55,174 @@ print(tab.id)
         errors = self.runtime.validate_code(code)
         assert any("socket" in e for e in errors)
     
+    def test_validate_blocks_imports_not_at_line_start(self):
+        """Imports after a semicolon or inside blocks are still blocked."""
+        assert self.runtime.validate_code("x = 1; import os")
+        assert self.runtime.validate_code("def f():\n    from subprocess import run")
+        assert self.runtime.validate_code("x = 'no imports here'") == []
+    
+    def test_validate_blocks_dotted_submodules(self):
+        """Blocking applies to the top-level package of dotted imports."""
+        assert any("os.path" in e for e in self.runtime.validate_code("import os.path"))
+        assert any("urllib.request" in e for e in self.runtime.validate_code("from urllib.request import urlopen"))
+        assert self.runtime.validate_code("import json.decoder") == []
+    
     def test_validate_catches_syntax_error(self):
         """Syntax errors are caught."""
         code = "def broken("
         errors = self.runtime.validate_code(code)
         assert any("Syntax" in e for e in errors)
     
+    def test_validate_catches_compile_time_errors(self):
+        """Errors only the compiler detects are reported as syntax errors."""
+        errors = self.runtime.validate_code("return 1")
+        assert any("Syntax" in e for e in errors)
+    
+    def test_repeated_code_is_compiled_once(self):
+        """Executing the same source twice reuses the cached compilation."""
+        self.caps.grant("agent:default", "tab.*", "*")
+        code = "__result__ = len(browser.Tab.list())"
+        
+        first = self.runtime.execute(code)
+        second = self.runtime.execute(code)
+        
+        assert first.state == second.state == ExecutionState.COMPLETED
+        assert len(self.runtime._code_cache) == 1
+        assert self.runtime.validate_code("import os") == self.runtime.validate_code("import os")
+    
+    def test_executions_reuse_worker_threads(self):
+        """Sequential executions run on one reused worker thread."""
+        for _ in range(3):
+            result = self.runtime.execute("__result__ = 1")
+            assert result.state == ExecutionState.COMPLETED
+        
+        assert len(self.runtime._pool._threads) == 1
+    
+    def test_execute_timeout(self):
+        """Scripts that outlive the timeout report TIMEOUT."""
+        runtime = AgentRuntime(
+            caps=self.caps,
+            objects=self.objects,
+            audit=self.audit,
+            transactions=self.transactions,
+            timeout_seconds=0.01,
+        )
+        
+        result = runtime.execute("for i in range(3000000): pass")
+        runtime.shutdown()
+        
+        assert result.state == ExecutionState.TIMEOUT
+        assert result.error_type == "Timeout"
+    
+    def test_busy_workers_report_saturation_not_timeout(self, monkeypatch):
+        """With every worker held by a stuck script, execute fails fast and recovers."""
+        import kernel.runtime as runtime_module
+        monkeypatch.setattr(runtime_module, "EXECUTION_WORKERS", 1)
+        runtime = AgentRuntime(
+            caps=self.caps,
+            objects=self.objects,
+            audit=self.audit,
+            transactions=self.transactions,
+            timeout_seconds=0.01,
+        )
+        
+        stuck = runtime.execute("for i in range(3000000): pass")
+        saturated = runtime.execute("__result__ = 1")
+        
+        assert stuck.error_type == "Timeout"
+        assert saturated.state == ExecutionState.FAILED
+        assert saturated.error_type == "RuntimeSaturated"
+        
+        # Once the stuck script returns, its worker serves again
+        deadline = time.monotonic() + 30
+        result = saturated
+        while result.error_type == "RuntimeSaturated" and time.monotonic() < deadline:
+            time.sleep(0.01)
+            result = runtime.execute("__result__ = 1")
+        runtime.shutdown()
+        
+        assert result.return_value == 1
+    
+    def test_builtins_tampering_does_not_leak_between_executions(self):
+        """One script rebinding a builtin can't affect the next script."""
+        self.runtime.execute("__builtins__['len'] = lambda x: 42")
+        
+        result = self.runtime.execute("__result__ = len([1, 2])")
+        
+        assert result.return_value == 2
+    
+    def test_execute_flushes_audit_before_returning(self, tmp_path):
+        """Audit entries from a script are on disk once execute returns."""
+        db = tmp_path / "audit.db"
+        audit = AuditLog(db)
+        caps = CapabilityBroker(audit_log=audit)
+        objects = ObjectManager(audit_log=audit)
+        runtime = AgentRuntime(caps, objects, audit, TransactionCoordinator(objects, audit))
+        caps.grant("agent:default", "tab.*", "*")
+        
+        runtime.execute("browser.Tab.open('https://example.com')")
+        
+        reader = AuditLog(db)
+        assert [e.op for e in reader.query(op="tab.open")] == ["tab.open"]
+        reader.close()
+        audit.close()
+    
+    def test_browser_api_reused_per_principal(self):
+        """Each principal gets one BrowserAPI, reused across calls."""
+        a1 = self.runtime.create_browser_api("agent:a")
+        a2 = self.runtime.create_browser_api("agent:a")
+        b = self.runtime.create_browser_api("agent:b")
+        
+        assert a1 is a2
+        assert b is not a1
+        assert b._principal == "agent:b"
+    
+    def test_auto_approve_does_not_carry_into_next_execution(self):
+        """Each execution starts deny-by-default, even for the same principal."""
+        first = self.runtime.execute(
+            "browser.human.set_auto_approve(True)\n"
+            "__result__ = browser.human.approve('first')"
+        )
+        second = self.runtime.execute("__result__ = browser.human.approve('second')")
+        
+        assert first.return_value is True
+        assert second.return_value is False
+    
+    def test_browser_api_cache_bounded_under_principal_churn(self):
+        """Unused BrowserAPIs beyond the recent window are released."""
+        import gc
+        from kernel.runtime import RECENT_API_COUNT
+        
+        for i in range(RECENT_API_COUNT * 3):
+            self.runtime.create_browser_api(f"agent:churn-{i}")
+        gc.collect()
+        
+        assert len(self.runtime._api_cache) == RECENT_API_COUNT
+    
+    def test_agent_code_does_not_inherit_kernel_future_flags(self):
+        """Agent code compiles with default semantics, not the runtime module's."""
+        result = self.runtime.execute("x: int = 1\n__result__ = __annotations__['x']")
+        
+        assert result.return_value is int
+    
+    def test_docstrings_stripped_but_asserts_kept(self):
+        """Docstrings are compiled away; assert statements still run."""
+        code = '''
+"""Module docstring."""
+def helper():
+    """Only a docstring."""
+def answer():
+    """Doc."""
+    return 42
+__result__ = (helper.__doc__, answer.__doc__, answer())
+'''
+        result = self.runtime.execute(code)
+        failed = self.runtime.execute("assert 1 == 2, 'boom'")
+        
+        assert result.return_value == (None, None, 42)
+        assert failed.state == ExecutionState.FAILED
+        assert failed.error_type == "AssertionError"
+    
     def test_execute_simple_code(self):
         """Simple code executes successfully."""
         # Grant capabilities
@@ -202,6 +367,17 @@ class TestBrowserAPI:
         
         assert form._data["filled"]["email"] == "test@example.com"
     
+    def test_form_fill_logs_field_names_only(self):
+        """The form.fill entry lists field names but never their values."""
+        self.browser.Tab.open("https://example.com")
+        self.browser.Form.find("tab:1", form_type="login")
+        
+        self.browser.Form.fill("form:1", {"email": "test@example.com", "name": "Ada"})
+        
+        entry = self.audit.query(op="form.fill")[0]
+        assert entry.args["fields"] == ["email", "name"]
+        assert "test@example.com" not in str(entry.args)
+    
     def test_form_clear(self):
         """browser.Form.clear empties form fields."""
         self.browser.Tab.open("https://example.com")
@@ -251,6 +427,46 @@ class TestBrowserAPI:
         
         assert result is True
     
+    def test_human_auto_approve_can_be_turned_off(self):
+        """set_auto_approve(False) restores deny-by-default."""
+        self.browser.human.set_auto_approve(True)
+        self.browser.human.set_auto_approve(False)
+        
+        assert self.browser.human.approve("Submit form?") is False
+    
+    def test_op_entry_records_capability(self):
+        """Mutating ops record their capability instead of a separate check row."""
+        cap = self.caps.list_capabilities("test-agent")[0]
+        
+        tab = self.browser.Tab.open("https://example.com")
+        
+        open_entries = self.audit.query(op="tab.open")
+        checks = self.audit.query(op="capability.check", principal="test-agent")
+        assert open_entries[0].args["capability"] == f"cap:{cap.token[:8]}"
+        assert [e.object for e in checks] == []
+    
+    def test_cached_permission_dropped_on_revoke(self):
+        """A revoke invalidates permissions memoized by the API."""
+        self.browser.Tab.open("https://a.com")
+        self.browser.Tab.open("https://b.com")
+        
+        self.caps.revoke_all("test-agent")
+        
+        with pytest.raises(CapabilityDenied):
+            self.browser.Tab.open("https://c.com")
+    
+    def test_cached_permission_dropped_on_expiry(self):
+        """An expired capability is not served from the API's cache."""
+        caps = CapabilityBroker()
+        caps.grant("temp-agent", "tab.create", "*", ttl_seconds=0.05)
+        browser = BrowserAPI("temp-agent", caps, self.objects, self.audit, self.transactions)
+        browser.Tab.open("https://a.com")
+        
+        time.sleep(0.1)
+        
+        with pytest.raises(CapabilityDenied):
+            browser.Tab.open("https://b.com")
+    
     def test_transaction_context_manager(self):
         """browser.transaction() provides context manager."""
         with self.browser.transaction() as tx:
@@ -336,3 +552,230 @@ browser.Tab.navigate(tab.id, 'https://new-url.com')
         
         assert "tab.open" in ops
         assert "tab.navigate" in ops
+
+
+class TestIPC:
+    """Tests for the IPC server and client."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.audit = AuditLog()
+        self.caps = CapabilityBroker(audit_log=self.audit)
+        self.objects = ObjectManager(audit_log=self.audit)
+        self.runtime = AgentRuntime(
+            caps=self.caps,
+            objects=self.objects,
+            audit=self.audit,
+            transactions=TransactionCoordinator(self.objects, self.audit),
+        )
+    
+    def _serve(self, socket_path):
+        import threading
+        import time
+        
+        server = IPCServer(str(socket_path), self.runtime)
+        thread = threading.Thread(target=server.start, daemon=True)
+        thread.start()
+        deadline = time.time() + 5
+        while not socket_path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        return server, thread
+    
+    def test_large_request_round_trip(self, tmp_path):
+        """Requests larger than one socket read arrive intact."""
+        server, thread = self._serve(tmp_path / "k.sock")
+        try:
+            code = "x = 1\n" * 20000 + "__result__ = x"
+            
+            response = IPCClient(str(tmp_path / "k.sock")).execute(code)
+            
+            assert len(code) > 65536
+            assert response["state"] == "completed"
+            assert response["return_value"] == 1
+        finally:
+            server.stop()
+            thread.join(timeout=5)
+    
+    def test_concurrent_clients_and_prompt_stop(self, tmp_path):
+        """Several clients are served at once and stop() returns promptly."""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        
+        server, thread = self._serve(tmp_path / "k.sock")
+        client = IPCClient(str(tmp_path / "k.sock"))
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(lambda i: client.validate(f"x = {i}"), range(8)))
+            assert all(r["valid"] for r in results)
+        finally:
+            start = time.time()
+            server.stop()
+            thread.join(timeout=5)
+        
+        assert not thread.is_alive()
+        assert time.time() - start < 0.5
+    
+    def test_non_ascii_round_trip(self, tmp_path):
+        """Non-ASCII text survives the compact UTF-8 encoding."""
+        server, thread = self._serve(tmp_path / "k.sock")
+        try:
+            response = IPCClient(str(tmp_path / "k.sock")).execute("__result__ = 'héllo ✓'")
+            
+            assert response["return_value"] == "héllo ✓"
+        finally:
+            server.stop()
+            thread.join(timeout=5)
+    
+    def test_client_reuses_connection(self, tmp_path):
+        """Successive calls share one connection until close()."""
+        server, thread = self._serve(tmp_path / "k.sock")
+        client = IPCClient(str(tmp_path / "k.sock"))
+        try:
+            client.validate("x = 1")
+            sock = client._sock
+            
+            response = client.execute("__result__ = 2")
+            
+            assert client._sock is sock
+            assert response["return_value"] == 2
+            
+            client.close()
+            assert client._sock is None
+            assert client.validate("x = 1")["valid"]
+        finally:
+            client.close()
+            server.stop()
+            thread.join(timeout=5)
+    
+    def test_idle_connections_do_not_pin_workers(self, tmp_path):
+        """More idle persistent clients than IPC workers can all be served."""
+        from kernel.runtime import IPC_WORKERS
+        
+        server, thread = self._serve(tmp_path / "k.sock")
+        clients = [IPCClient(str(tmp_path / "k.sock")) for _ in range(IPC_WORKERS + 2)]
+        try:
+            for client in clients:
+                assert client.validate("x = 1")["valid"]
+            for client in clients:
+                assert client.validate("y = 2")["valid"]
+        finally:
+            for client in clients:
+                client.close()
+            server.stop()
+            thread.join(timeout=5)
+        
+        assert not thread.is_alive()
+    
+    def test_silent_connections_do_not_pin_workers(self, tmp_path):
+        """Clients that connect and never send don't starve other clients."""
+        import socket
+        from kernel.runtime import IPC_WORKERS, _recv_message, _send_message
+        
+        server, thread = self._serve(tmp_path / "k.sock")
+        socks = []
+        try:
+            for _ in range(IPC_WORKERS + 2):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(5)
+                sock.connect(str(tmp_path / "k.sock"))
+                socks.append(sock)
+            
+            # The last connection speaks; the others stay silent
+            _send_message(socks[-1], {"method": "validate", "params": {"code": "x = 1"}})
+            
+            assert _recv_message(socks[-1])["valid"]
+        finally:
+            for sock in socks:
+                sock.close()
+            server.stop()
+            thread.join(timeout=5)
+        
+        assert not thread.is_alive()
+    
+    def test_client_reconnects_after_server_restart(self, tmp_path):
+        """A dead persistent connection is replaced transparently once."""
+        server, thread = self._serve(tmp_path / "k.sock")
+        client = IPCClient(str(tmp_path / "k.sock"))
+        try:
+            client.validate("x = 1")
+            server.stop()
+            thread.join(timeout=5)
+            
+            server, thread = self._serve(tmp_path / "k.sock")
+            
+            assert client.validate("x = 1")["valid"]
+        finally:
+            client.close()
+            server.stop()
+            thread.join(timeout=5)
+    
+    def test_client_does_not_resend_after_request_written(self, tmp_path):
+        """A connection lost while awaiting the response isn't retried."""
+        import socket
+        import threading
+        from kernel.runtime import _recv_message, _send_message
+        
+        path = str(tmp_path / "k.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+        listener.settimeout(5)
+        received = []
+        
+        def serve():
+            conn, _ = listener.accept()
+            received.append(_recv_message(conn))
+            _send_message(conn, {"valid": True})
+            received.append(_recv_message(conn))
+            conn.close()  # Dies after reading the request, before replying
+            listener.settimeout(0.5)
+            try:
+                retry, _ = listener.accept()
+            except socket.timeout:
+                return
+            received.append(_recv_message(retry))
+            retry.close()
+        
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        client = IPCClient(path)
+        try:
+            assert client.validate("x = 1")["valid"]
+            with pytest.raises(ConnectionError):
+                client.execute("__result__ = 1")
+            thread.join(timeout=5)
+        finally:
+            client.close()
+            listener.close()
+        
+        assert [r["method"] for r in received] == ["validate", "execute"]
+    
+    @pytest.mark.skipif(sys.platform != "linux", reason="abstract sockets are Linux-only")
+    def test_abstract_socket_round_trip(self):
+        """A NUL-prefixed path serves over an abstract socket with no file."""
+        import os
+        import threading
+        
+        name = f"\0terminalagent-test-{os.getpid()}-{id(self)}"
+        server = IPCServer(name, self.runtime)
+        thread = threading.Thread(target=server.start, daemon=True)
+        thread.start()
+        client = IPCClient(name)
+        try:
+            deadline = time.time() + 5
+            while True:
+                try:
+                    response = client.execute("__result__ = 7")
+                    break
+                except (ConnectionRefusedError, FileNotFoundError):
+                    if time.time() > deadline:
+                        raise
+                    time.sleep(0.01)
+            
+            assert response["return_value"] == 7
+        finally:
+            client.close()
+            server.stop()
+            thread.join(timeout=5)
+        
+        assert not thread.is_alive()
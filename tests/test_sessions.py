@@ -7,7 +7,7 @@ import pytest
 
 from kernel.sessions import (
     SessionManager, Session, SessionType, GrantScope,
-    CapabilityGrant, RevocationRecord,
+    CapabilityGrant, RevocationRecord, SCHEMA_VERSION,
 )
 
 
@@ -118,6 +118,22 @@ class TestGrantManagement:
         assert grant.id.startswith("grant:")
         assert grant.is_active()
     
+    def test_ids_unique_and_ordered_across_managers(self):
+        """Record ids never repeat in a process and sort by creation."""
+        mgr1 = SessionManager()
+        mgr2 = SessionManager()
+        
+        ids = []
+        for mgr in (mgr1, mgr2, mgr1):
+            grant = mgr.record_grant(
+                token="t", principal="agent:1", operation="op",
+                resource="*", scope=GrantScope.SESSION, granted_by="user"
+            )
+            ids.append(grant.id)
+        
+        assert len(set(ids)) == 3
+        assert ids == sorted(ids)
+    
     def test_revoke_grant(self):
         """Revoke a grant."""
         mgr = SessionManager()
@@ -195,6 +211,40 @@ class TestGrantManagement:
         assert len(active) == 1
         assert active[0].token == "token2"
     
+    def test_list_grants_cache_invalidation(self):
+        """Memoized listings reflect later grants, revocations and expiry."""
+        mgr = SessionManager()
+        mgr.record_grant(
+            token="t1", principal="agent:1", operation="op1",
+            resource="*", scope=GrantScope.SESSION, granted_by="user",
+            expires_at=time.time() + 0.05,
+        )
+        assert [g.token for g in mgr.list_grants(principal="agent:1")] == ["t1"]
+        
+        g2 = mgr.record_grant(
+            token="t2", principal="agent:1", operation="op2",
+            resource="*", scope=GrantScope.SESSION, granted_by="user"
+        )
+        assert {g.token for g in mgr.list_grants(principal="agent:1")} == {"t1", "t2"}
+        
+        time.sleep(0.06)
+        assert [g.token for g in mgr.list_grants(principal="agent:1")] == ["t2"]
+        
+        mgr.revoke_grant(g2.id, revoked_by="user")
+        assert mgr.list_grants(principal="agent:1") == []
+    
+    def test_list_grants_returns_fresh_list(self):
+        """Mutating a returned list doesn't affect later calls."""
+        mgr = SessionManager()
+        mgr.record_grant(
+            token="t1", principal="agent:1", operation="op1",
+            resource="*", scope=GrantScope.SESSION, granted_by="user"
+        )
+        
+        mgr.list_grants().clear()
+        
+        assert len(mgr.list_grants()) == 1
+    
     def test_revoke_all_for_principal(self):
         """Revoke all grants for a principal."""
         mgr = SessionManager()
@@ -218,6 +268,106 @@ class TestGrantManagement:
         assert len(mgr.list_grants(principal="agent:bad", active_only=True)) == 0
         assert len(mgr.list_grants(principal="agent:good", active_only=True)) == 1
 
+    
+    def test_list_grants_across_principals(self):
+        """Without a principal, active and full listings span everyone."""
+        mgr = SessionManager()
+        g1 = mgr.record_grant(
+            token="t1", principal="agent:1", operation="op1",
+            resource="*", scope=GrantScope.SESSION, granted_by="user"
+        )
+        mgr.record_grant(
+            token="t2", principal="agent:2", operation="op2",
+            resource="*", scope=GrantScope.SESSION, granted_by="user"
+        )
+        mgr.revoke_grant(g1.id, revoked_by="user")
+        
+        active = mgr.list_grants()
+        everything = mgr.list_grants(active_only=False)
+        
+        assert [g.token for g in active] == ["t2"]
+        assert sorted(g.token for g in everything) == ["t1", "t2"]
+        assert mgr.list_grants(principal="agent:unknown") == []
+    
+    def test_end_session_leaves_other_sessions_alone(self):
+        """Ending one session doesn't touch grants from another."""
+        mgr = SessionManager()
+        s1 = mgr.create_session("agent:1", SessionType.PROCESS)
+        s2 = mgr.create_session("agent:1", SessionType.PROCESS)
+        g1 = mgr.record_grant(
+            token="t1", principal="agent:1", operation="op",
+            resource="*", scope=GrantScope.SESSION, granted_by="user", session_id=s1.id
+        )
+        g2 = mgr.record_grant(
+            token="t2", principal="agent:1", operation="op",
+            resource="*", scope=GrantScope.SESSION, granted_by="user", session_id=s2.id
+        )
+        
+        mgr.end_session(s1.id)
+        
+        assert not g1.is_active()
+        assert g2.is_active()
+    
+    def test_is_active_at_explicit_time(self):
+        """is_active/is_expired evaluate against a supplied timestamp."""
+        mgr = SessionManager()
+        grant = mgr.record_grant(
+            token="t1", principal="agent:1", operation="op",
+            resource="*", scope=GrantScope.SESSION, granted_by="user",
+            expires_at=1000.0,
+        )
+        session = mgr.create_session("agent:1", SessionType.TIMED, ttl_seconds=60)
+        
+        assert grant.is_active(now=999.0)
+        assert not grant.is_active(now=1001.0)
+        assert not session.is_expired(now=session.created_at)
+        assert session.is_expired(now=session.created_at + 120)
+    
+    def test_list_grants_skips_expired(self):
+        """Expired grants are not listed as active."""
+        mgr = SessionManager()
+        mgr.record_grant(
+            token="old", principal="agent:1", operation="op",
+            resource="*", scope=GrantScope.SESSION, granted_by="user",
+            expires_at=time.time() - 1,
+        )
+        
+        assert mgr.list_grants(principal="agent:1") == []
+        assert mgr.revoke_all_for_principal("agent:1", revoked_by="admin") == 0
+    
+    def test_to_dict_round_trip(self):
+        """to_dict/from_dict round-trip and don't share metadata."""
+        mgr = SessionManager()
+        session = mgr.create_session("agent:1", SessionType.PROCESS, metadata={"tags": ["a"]})
+        grant = mgr.record_grant(
+            token="t1", principal="agent:1", operation="op",
+            resource="*", scope=GrantScope.SESSION, granted_by="user",
+            metadata={"tags": ["b"]},
+        )
+        mgr.revoke_grant(grant.id, revoked_by="user", reason="done")
+        revocation = mgr.list_revocations()[0]
+        
+        session_dict = session.to_dict()
+        session_dict["metadata"]["tags"].append("x")
+        
+        assert session.metadata == {"tags": ["a"]}
+        assert Session.from_dict(session.to_dict()) == session
+        assert CapabilityGrant.from_dict(grant.to_dict()) == grant
+        assert RevocationRecord.from_dict(revocation.to_dict()) == revocation
+        assert grant.to_dict()["scope"] == "session"
+    
+    def test_from_dict_rejects_unknown_enum_values(self):
+        """Unknown scope/type values still raise ValueError."""
+        mgr = SessionManager()
+        grant = mgr.record_grant(
+            token="t1", principal="agent:1", operation="op",
+            resource="*", scope=GrantScope.SESSION, granted_by="user"
+        )
+        data = grant.to_dict()
+        data["scope"] = "forever"
+        
+        with pytest.raises(ValueError):
+            CapabilityGrant.from_dict(data)
 
 class TestRevocationPersistence:
     """Tests for revocation persistence across restarts."""
@@ -279,6 +429,157 @@ class TestRevocationPersistence:
         finally:
             Path(db_path).unlink(missing_ok=True)
 
+    
+    def test_session_grant_revocation_indexed_after_restart(self):
+        """Revocations of unpersisted grants are still found after restart."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+        
+        try:
+            mgr1 = SessionManager(db_path=db_path)
+            grant = mgr1.record_grant(
+                token="session-only-token",
+                principal="agent:1",
+                operation="tab.read",
+                resource="*",
+                scope=GrantScope.SESSION,
+                granted_by="user",
+            )
+            mgr1.revoke_grant(grant.id, revoked_by="user")
+            
+            mgr2 = SessionManager(db_path=db_path)
+            
+            assert mgr2.is_token_revoked("session-only-token")
+            assert not mgr2.is_token_revoked("other-token")
+            assert mgr2.get_grant_by_token("session-only-token") is None
+        finally:
+            Path(db_path).unlink(missing_ok=True)
+    
+    def test_bulk_revoke_persists_every_grant(self):
+        """revoke_all_for_principal persists all revocations and grant updates."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+        
+        try:
+            mgr1 = SessionManager(db_path=db_path)
+            for i in range(5):
+                mgr1.record_grant(
+                    token=f"bulk-{i}", principal="agent:bulk", operation="tab.read",
+                    resource="*", scope=GrantScope.ALWAYS, granted_by="user"
+                )
+            
+            assert mgr1.revoke_all_for_principal("agent:bulk", revoked_by="admin") == 5
+            
+            mgr2 = SessionManager(db_path=db_path)
+            for i in range(5):
+                grant = mgr2.get_grant_by_token(f"bulk-{i}")
+                assert mgr2.is_token_revoked(f"bulk-{i}")
+                assert not grant.is_active()
+                assert grant.revoked_by == "admin"
+            assert len(mgr2.list_revocations(principal="agent:bulk")) == 5
+        finally:
+            Path(db_path).unlink(missing_ok=True)
+    
+    def test_file_database_uses_wal(self, tmp_path):
+        """File-backed managers open the database in WAL mode."""
+        mgr = SessionManager(db_path=tmp_path / "sessions.db")
+        
+        mode = mgr._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        
+        assert mode == "wal"
+    
+    def test_failed_transaction_rolls_back(self, tmp_path):
+        """A multi-statement write that fails leaves nothing behind."""
+        mgr = SessionManager(db_path=tmp_path / "sessions.db")
+        
+        with pytest.raises(RuntimeError):
+            with mgr._transaction():
+                mgr._conn.execute(
+                    "INSERT INTO sessions VALUES ('session:x', 'persistent', 'a', 0, NULL, NULL, '{}')"
+                )
+                raise RuntimeError("boom")
+        
+        count = mgr._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        assert count == 0
+        assert not mgr._conn.in_transaction
+    
+    def test_active_grant_index_excludes_revoked(self, tmp_path):
+        """The partial index serves active lookups and skips revoked rows."""
+        mgr = SessionManager(db_path=tmp_path / "sessions.db")
+        for token in ("keep", "drop"):
+            mgr.record_grant(
+                token=token, principal="agent:1", operation="op",
+                resource="*", scope=GrantScope.ALWAYS, granted_by="user"
+            )
+        mgr.revoke_grant(mgr.get_grant_by_token("drop").id, revoked_by="user")
+        query = (
+            "SELECT token FROM grants INDEXED BY idx_grants_active "
+            "WHERE principal = ? AND revoked_at IS NULL ORDER BY granted_at DESC"
+        )
+        
+        rows = mgr._conn.execute(query, ("agent:1",)).fetchall()
+        
+        assert rows == [("keep",)]
+    
+    def test_metadata_round_trips(self, tmp_path):
+        """Session and grant metadata survive a restart, empty or not."""
+        db_path = tmp_path / "sessions.db"
+        mgr1 = SessionManager(db_path=db_path)
+        session = mgr1.create_session(
+            "agent:1", SessionType.PERSISTENT, metadata={"ui": "tui", "n": [1, 2]}
+        )
+        mgr1.record_grant(
+            token="meta-token", principal="agent:1", operation="tab.read",
+            resource="*", scope=GrantScope.ALWAYS, granted_by="user",
+            metadata={"note": "héllo"},
+        )
+        mgr1.record_grant(
+            token="plain-token", principal="agent:1", operation="tab.read",
+            resource="*", scope=GrantScope.ALWAYS, granted_by="user",
+        )
+        
+        mgr2 = SessionManager(db_path=db_path)
+        
+        assert mgr2.get_session(session.id).metadata == {"ui": "tui", "n": [1, 2]}
+        assert mgr2.get_grant_by_token("meta-token").metadata == {"note": "héllo"}
+        assert mgr2.get_grant_by_token("plain-token").metadata == {}
+    
+    def test_opens_database_with_legacy_indexes(self, tmp_path):
+        """A database created before the index change still opens and loads."""
+        db_path = tmp_path / "sessions.db"
+        mgr1 = SessionManager(db_path=db_path)
+        mgr1.record_grant(
+            token="old-token", principal="agent:1", operation="tab.read",
+            resource="*", scope=GrantScope.ALWAYS, granted_by="user"
+        )
+        mgr1._conn.execute("CREATE INDEX idx_grants_principal ON grants(principal)")
+        # Databases from before schema versioning report user_version 0
+        mgr1._conn.execute("PRAGMA user_version = 0")
+        
+        mgr2 = SessionManager(db_path=db_path)
+        indexes = {
+            row[0] for row in
+            mgr2._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        
+        assert mgr2.get_grant_by_token("old-token") is not None
+        assert "idx_grants_principal" not in indexes
+        assert "idx_grants_active" in indexes
+        assert mgr2._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    
+    def test_current_schema_skips_init_script(self, tmp_path):
+        """Reopening an up-to-date database doesn't rerun the schema script."""
+        db_path = tmp_path / "sessions.db"
+        mgr1 = SessionManager(db_path=db_path)
+        mgr1._conn.execute("DROP INDEX idx_revocations_token")
+        
+        mgr2 = SessionManager(db_path=db_path)
+        indexes = {
+            row[0] for row in
+            mgr2._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        
+        assert "idx_revocations_token" not in indexes
 
 class TestGrantScopes:
     """Tests for different grant scopes."""
@@ -341,3 +642,70 @@ class TestGrantScopes:
             assert grant.is_active()
         finally:
             Path(db_path).unlink(missing_ok=True)
+
+
+class TestBackgroundWrites:
+    """Tests for buffered persistence with background_writes=True."""
+    
+    def _record(self, mgr, token):
+        return mgr.record_grant(
+            token=token, principal="agent:1", operation="tab.read",
+            resource="*", scope=GrantScope.ALWAYS, granted_by="user"
+        )
+    
+    def test_writer_persists_without_explicit_flush(self, tmp_path):
+        """Buffered grants reach disk shortly after being recorded."""
+        import sqlite3
+        
+        db_path = tmp_path / "sessions.db"
+        mgr = SessionManager(db_path=db_path, background_writes=True)
+        self._record(mgr, "bg-token")
+        
+        deadline = time.time() + 5
+        reader = sqlite3.connect(db_path)
+        while time.time() < deadline:
+            if reader.execute("SELECT COUNT(*) FROM grants").fetchone()[0] == 1:
+                break
+            time.sleep(0.01)
+        
+        assert reader.execute("SELECT token FROM grants").fetchall() == [("bg-token",)]
+        reader.close()
+        mgr.close()
+    
+    def test_close_flushes_buffered_writes(self, tmp_path):
+        """close() commits everything still buffered."""
+        db_path = tmp_path / "sessions.db"
+        mgr1 = SessionManager(db_path=db_path, background_writes=True)
+        session = mgr1.create_session("agent:1", SessionType.PERSISTENT)
+        for i in range(50):
+            self._record(mgr1, f"t{i}")
+        
+        mgr1.close()
+        mgr2 = SessionManager(db_path=db_path)
+        
+        assert mgr1.closed
+        assert mgr2.get_session(session.id) is not None
+        assert len(mgr2.list_grants(principal="agent:1")) == 50
+    
+    def test_close_releases_exit_hook(self, tmp_path):
+        """Only open managers with buffered writes are kept for the exit hook."""
+        from kernel.sessions import _open_managers
+        mgr = SessionManager(db_path=tmp_path / "sessions.db", background_writes=True)
+        assert mgr in _open_managers
+        
+        mgr.close()
+        
+        assert mgr not in _open_managers
+    
+    def test_revoking_buffered_grant_persists_revocation(self, tmp_path):
+        """A revoke right after a buffered grant can't be lost or reordered."""
+        db_path = tmp_path / "sessions.db"
+        mgr1 = SessionManager(db_path=db_path, background_writes=True)
+        grant = self._record(mgr1, "quick-token")
+        
+        mgr1.revoke_grant(grant.id, revoked_by="user")
+        mgr2 = SessionManager(db_path=db_path)
+        
+        assert mgr2.is_token_revoked("quick-token")
+        assert not mgr2.get_grant_by_token("quick-token").is_active()
+        mgr1.close()
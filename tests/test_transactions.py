@@ -9,6 +9,7 @@ from kernel.transactions import (
     TransactionError,
     TransactionNotActive,
     CheckpointNotFound,
+    CHECKPOINT_CHAIN_LIMIT,
 )
 
 
@@ -27,6 +28,18 @@ class TestTransactionCoordinator:
             assert tx.id.startswith("tx:")
             assert tx.is_active
     
+    def test_transaction_ids_unique_and_ordered(self):
+        """Transaction ids are unique across coordinators and sort by start."""
+        other = TransactionCoordinator(ObjectManager())
+        ids = []
+        for coord in (self.tx_coord, other, self.tx_coord):
+            with coord.begin() as tx:
+                ids.append(tx.id)
+                tx.commit()
+        
+        assert len(set(ids)) == 3
+        assert ids == sorted(ids)
+    
     def test_commit_finalizes_transaction(self):
         """commit() marks transaction as committed."""
         with self.tx_coord.begin() as tx:
@@ -106,6 +119,17 @@ class TestTransactionCoordinator:
             assert tab.url == "https://original.com"
             tx.commit()
     
+    def test_list_checkpoints_in_creation_order(self):
+        """list_checkpoints returns user checkpoints only, oldest first."""
+        with self.tx_coord.begin() as tx:
+            tx.checkpoint("b")
+            tx.checkpoint("a")
+            
+            assert self.tx_coord.list_checkpoints() == ["b", "a"]
+            with pytest.raises(TransactionError):
+                tx.checkpoint("__initial__")
+            tx.commit()
+    
     def test_rollback_nonexistent_checkpoint_raises(self):
         """Rollback to nonexistent checkpoint raises."""
         with self.tx_coord.begin() as tx:
@@ -145,6 +169,144 @@ class TestTransactionCoordinator:
             assert form._data["filled"] == {}
             tx.commit()
     
+    def test_checkpoints_share_unchanged_state(self):
+        """A checkpoint reuses the previous checkpoint's state for unchanged objects."""
+        tab = self.objects.create(ObjectType.TAB, url="https://start.com")
+        other = self.objects.create(ObjectType.TAB, url="https://other.com")
+        
+        with self.tx_coord.begin() as tx:
+            first = tx.checkpoint("first")
+            tab.navigate("https://step1.com")
+            second = tx.checkpoint("second")
+            tab.navigate("https://step2.com")
+            
+            tx.rollback("first")
+            assert tab.url == "https://start.com"
+            tx.rollback("second")
+            assert tab.url == "https://step1.com"
+            
+            assert second.state[other.id] is first.state[other.id]
+            assert second.state[tab.id] is not first.state[tab.id]
+            tx.commit()
+    
+    def test_begin_reuses_previous_transaction_state(self):
+        """A new transaction's initial checkpoint shares states still unchanged."""
+        tab = self.objects.create(ObjectType.TAB, url="https://start.com")
+        other = self.objects.create(ObjectType.TAB, url="https://other.com")
+        
+        with self.tx_coord.begin() as tx:
+            first = self.tx_coord.get_active_transaction().initial_checkpoint.state
+            tx.commit()
+        tab.navigate("https://changed.com")
+        with self.tx_coord.begin() as tx:
+            second = self.tx_coord.get_active_transaction().initial_checkpoint.state
+            tab.navigate("https://again.com")
+            tx.abort()
+        
+        assert second[other.id] is first[other.id]
+        assert second[tab.id] is not first[tab.id]
+        assert tab.url == "https://changed.com"
+    
+    def test_checkpoint_stores_delta_against_parent(self):
+        """Checkpoints after the first store only changes since their parent."""
+        tab = self.objects.create(ObjectType.TAB, url="https://start.com")
+        other = self.objects.create(ObjectType.TAB, url="https://other.com")
+        gone = self.objects.create(ObjectType.TAB, url="https://gone.com")
+        
+        with self.tx_coord.begin() as tx:
+            tab.navigate("https://step1.com")
+            self.objects.delete(gone.id)
+            cp = tx.checkpoint("step1")
+            
+            assert set(cp.delta) == {tab.id}
+            assert cp.removed == {gone.id}
+            assert set(cp.state) == {tab.id, other.id}
+            
+            tab.navigate("https://step2.com")
+            tx.rollback("step1")
+            assert tab.url == "https://step1.com"
+            tx.commit()
+    
+    def test_checkpoint_chain_is_bounded(self):
+        """A long run of checkpoints periodically stores a full one."""
+        tab = self.objects.create(ObjectType.TAB, url="https://start.com")
+        
+        with self.tx_coord.begin() as tx:
+            for i in range(CHECKPOINT_CHAIN_LIMIT + 1):
+                tab.navigate(f"https://step{i}.com")
+                cp = tx.checkpoint(f"step{i}")
+            
+            assert cp.parent is None
+            tx.rollback("step3")
+            assert tab.url == "https://step3.com"
+            tx.commit()
+    
+    def test_begin_reads_the_clock_once(self):
+        """The transaction and its initial checkpoint share one timestamp."""
+        tab = self.objects.create(ObjectType.TAB, url="https://start.com")
+        
+        with self.tx_coord.begin() as tx:
+            active = self.tx_coord.get_active_transaction()
+            initial = active.initial_checkpoint
+            
+            assert initial.timestamp == active.started_at
+            assert initial.state[tab.id].timestamp == active.started_at
+            tx.commit()
+    
+    def test_abort_does_not_corrupt_concurrent_checkpoint(self):
+        """A checkpoint taken after another transaction aborts captures the restored state."""
+        tab = self.objects.create(ObjectType.TAB, url="https://v0.com")
+        
+        a = self.tx_coord.begin()
+        tab.navigate("https://v1.com")
+        b = self.tx_coord.begin()
+        a.abort()
+        assert tab.url == "https://v0.com"
+        
+        b.checkpoint("x")
+        tab.navigate("https://v2.com")
+        b.rollback("x")
+        
+        assert tab.url == "https://v0.com"
+        b.commit()
+    
+    def test_ended_transactions_release_checkpoint_state(self):
+        """Commit and abort drop checkpoint state but keep checkpoint metadata."""
+        self.objects.create(ObjectType.TAB, url="https://start.com")
+        
+        for end in ("commit", "abort"):
+            with self.tx_coord.begin() as tx:
+                cp = tx.checkpoint("cp")
+                getattr(tx, end)()
+            
+            stored = self.tx_coord.get_transaction(tx.id)
+            assert stored.checkpoints["cp"] is cp
+            assert cp.state == {}
+            assert stored.initial_checkpoint.state == {}
+    
+    def test_finished_transaction_history_is_capped(self):
+        """Only the most recent finished transactions are kept."""
+        from kernel.transactions import MAX_FINISHED_TRANSACTIONS
+        ids = []
+        for _ in range(MAX_FINISHED_TRANSACTIONS + 1):
+            with self.tx_coord.begin() as tx:
+                ids.append(tx.id)
+                tx.commit()
+        
+        assert self.tx_coord.get_transaction(ids[0]) is None
+        assert self.tx_coord.get_transaction(ids[1]) is not None
+        assert self.tx_coord.get_transaction(ids[-1]) is not None
+    
+    def test_transaction_records_have_no_instance_dict(self):
+        """Transactions, checkpoints and contexts are slotted."""
+        with self.tx_coord.begin() as tx:
+            cp = tx.checkpoint("cp")
+            records = (tx, cp, self.tx_coord.get_active_transaction())
+            tx.commit()
+        
+        for record in records:
+            assert not hasattr(record, "__dict__")
+    
     def test_operations_outside_transaction(self):
         """Operations outside transactions are not reversible."""
         tab = self.objects.create(ObjectType.TAB, url="https://original.com")
@@ -186,6 +348,34 @@ class TestTransactionAuditIntegration:
         assert "transaction.checkpoint" in ops
         assert "transaction.commit" in ops
     
+    def test_only_commit_and_abort_write_on_caller_thread(self):
+        """begin/checkpoint/rollback entries are buffered for a batched write."""
+        import threading
+        audit = AuditLog(flush_every=1)
+        objects = ObjectManager()
+        tx_coord = TransactionCoordinator(objects, audit)
+        flushed_on = []
+        flush_locked = audit._flush_locked
+        
+        def record_flush():
+            if audit._pending:
+                flushed_on.append((threading.current_thread(), [row[2] for row in audit._pending]))
+            flush_locked()
+        
+        audit._flush_locked = record_flush
+        with tx_coord.begin() as tx:
+            tx.checkpoint("cp1")
+            tx.rollback("cp1")
+            tx.commit()
+        
+        caller_batches = [ops for thread, ops in flushed_on if thread is threading.current_thread()]
+        assert caller_batches
+        assert all(ops[-1] == "transaction.commit" for ops in caller_batches)
+        assert [e.op for e in audit.query(op="transaction.*")] == [
+            "transaction.begin", "transaction.checkpoint",
+            "transaction.rollback", "transaction.commit",
+        ]
+    
     def test_entries_tagged_with_transaction_id(self):
         """Log entries during tx are tagged with tx_id."""
         audit = AuditLog()